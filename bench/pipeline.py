@@ -0,0 +1,220 @@
+"""
+추천 파이프라인 벤치마크 (Streamlit 없이 ootd 패키지만 import)
+
+    python bench/pipeline.py --out bench/results/pipeline.json
+    python bench/pipeline.py --quick            # 작은 크기만 (빠른 확인용)
+
+- 합성 옷장 10 ~ 10,000개, 피드백 기록 최대 100,000개 (seed 고정 → 버전 간 비교 가능)
+- 항목별 latency(ms, median/min) + peak memory(KB, tracemalloc 로 1회 따로 측정)
+- recommend(beam/exact), recommend_batch(7일×상황 3개), taste_score_for_outfit, taste 업데이트/replay, 저장소(sqlite/json) 읽기/쓰기
+"""
+import argparse, json, random, shutil, statistics, subprocess, sys, tempfile, time, tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ootd.closet_index import ClosetIndex
+from ootd.scoring import recommend, recommend_batch, taste_score_for_outfit
+from ootd.storage import open_store
+from ootd.taste import replay_profile, update_taste_from_feedback
+from ootd.vocab import CATEGORIES, COLORS, PATTERNS, WARMTH, VIBES, STYLES, SITUATIONS
+
+NAMES = ["검정 셔츠", "슬랙스", "후드티", "청바지", "운동화", "로퍼", "코트", "니트", "조거", "스니커즈", "맨투맨", "자켓"]
+FEEDBACK = ["좋음", "별로", "상관없음"]
+
+# =========================
+# Synthetic data
+# =========================
+def synth_closet(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [{
+        "id": f"item_{i}",
+        "type": CATEGORIES[i % len(CATEGORIES)] if i < len(CATEGORIES) else rng.choice(CATEGORIES),
+        "name": rng.choice(NAMES),
+        "primary_style": rng.choice(STYLES),
+        "secondary_style": None,
+        "image": f"data/users/bench/images/item_{i}.png",
+        "color": rng.choice(COLORS),
+        "pattern": rng.choice(PATTERNS),
+        "warmth": rng.choice(WARMTH),
+        "vibe": rng.choice(VIBES),
+        "desc": "",
+        "created_at": (start + timedelta(minutes=i)).isoformat(),
+        "source": "bench",
+    } for i in range(n)]
+
+def synth_feedback(closet, n, seed=0):
+    rng = random.Random(seed)
+    by_type = {c: [it for it in closet if it["type"] == c] for c in CATEGORIES}
+    start = datetime(2025, 1, 1)
+    out = []
+    for i in range(n):
+        outfit = {c: rng.choice(by_type[c])["id"] for c in ("top", "bottom", "shoes") if by_type[c]}
+        out.append({
+            "time": (start + timedelta(hours=i)).isoformat(),
+            "rating": rng.randint(1, 5),
+            "temp_feedback": rng.choice(["추움", "딱 좋음", "더움"]),
+            "style_feedback": {k: rng.choice(FEEDBACK) for k in ("color", "pattern", "vibe")},
+            "note": "",
+            "outfit": outfit,
+        })
+    return out
+
+def synth_profile(closet, n_feedback, seed=0):
+    items = {it["id"]: it for it in closet}
+    return replay_profile(iter(synth_feedback(closet, n_feedback, seed)), items)
+
+# =========================
+# Measurement
+# =========================
+def measure(fn, repeat=5, setup=None):
+    """
+    - 시간: tracemalloc 끈 상태로 repeat 번 (median/min)
+    - 메모리: tracemalloc 켜고 1번 더 → peak (setup 에서 만든 것 제외)
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t = time.perf_counter()
+        fn(arg) if setup else fn()
+        times.append((time.perf_counter() - t) * 1000)
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn(arg) if setup else fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kb": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+def bench_recommend(sizes, exact_max, repeat):
+    out = {}
+    weather = {"temperature": 8.0}
+    for n in sizes:
+        closet = synth_closet(n, seed=n)
+        profile = synth_profile(closet, 200, seed=n)
+        index = ClosetIndex(closet)
+        row = {}
+        row["index_build"] = measure(lambda: ClosetIndex(closet), repeat)
+        row["beam"] = measure(lambda: recommend(profile, index, weather, SITUATIONS[1]), repeat)
+        # 컬럼/인덱스까지 매번 새로 (첫 렌더와 같은 조건)
+        row["beam_cold"] = measure(lambda: recommend(profile, closet, weather, SITUATIONS[1]), repeat)
+        if n <= exact_max:
+            row["exact"] = measure(lambda: recommend(profile, index, weather, SITUATIONS[1], search="exact"),
+                                   max(1, repeat // 2))
+        # 7일 × 상황 3개: recommend 21번 vs recommend_batch 1번
+        contexts = [(s, {"temperature": 4.0 + 3 * d}) for d in range(7) for s in SITUATIONS[:3]]
+        row["loop_21"] = measure(lambda: [recommend(profile, index, w, s) for s, w in contexts], repeat)
+        row["batch_21"] = measure(lambda: recommend_batch(profile, index, contexts), repeat)
+        _, cands, _, _ = recommend(profile, index, weather, SITUATIONS[1])
+        outfit = cands[0]["outfit"]
+        row["taste_score_for_outfit"] = measure(lambda: [taste_score_for_outfit(profile, outfit) for _ in range(100)],
+                                                repeat)
+        row["taste_score_for_outfit"]["calls"] = 100
+        out[str(n)] = row
+    return out
+
+def bench_taste(feedback_sizes, repeat):
+    out = {}
+    closet = synth_closet(500, seed=1)
+    items = {it["id"]: it for it in closet}
+    for n in feedback_sizes:
+        logs = synth_feedback(closet, n, seed=n)
+        row = {}
+        row["replay"] = measure(lambda: replay_profile(iter(logs), items), max(1, repeat // 2))
+        profile = replay_profile(iter(logs), items)
+        outfit = {k: items[i] for k, i in logs[-1]["outfit"].items()}
+
+        def one_update(p):
+            update_taste_from_feedback(p, outfit, 4, "딱 좋음", "좋음", "별로", "좋음")
+        row["update_one"] = measure(one_update, repeat, setup=lambda: json.loads(json.dumps(profile)))
+        out[str(n)] = row
+    return out
+
+def bench_storage(closet_sizes, feedback_sizes, repeat):
+    out = {}
+    root = tempfile.mkdtemp(prefix="ootd_bench_")
+    for backend in ("sqlite", "json"):
+        rows = {}
+        for n in closet_sizes:
+            closet = synth_closet(n, seed=n)
+
+            def fresh():
+                return open_store(Path(tempfile.mkdtemp(dir=root)), backend=backend)
+            store = fresh()
+            store.add_items(closet)
+            rows[f"closet_{n}"] = {
+                "add_items": measure(lambda s: s.add_items(closet), max(1, repeat // 2), setup=fresh),
+                "load_closet": measure(store.load_closet, repeat),
+                "add_item_one": measure(lambda: store.add_item(dict(closet[0], id=f"x_{time.time_ns()}")), repeat),
+                "delete_item": measure(lambda: store.delete_item(closet[-1]["id"]), repeat),
+            }
+        closet = synth_closet(500, seed=1)
+        for n in feedback_sizes:
+            logs = synth_feedback(closet, n, seed=n)
+            store = open_store(Path(tempfile.mkdtemp(dir=root)), backend=backend)
+            store.save_feedback(logs)
+            profile = synth_profile(closet, 200)
+            rows[f"feedback_{n}"] = {
+                "append_feedback": measure(lambda: store.append_feedback(logs[0]), repeat),
+                "count_feedback": measure(store.count_feedback, repeat),
+                "tail_feedback_5": measure(lambda: store.tail_feedback(5), repeat),
+                "iter_feedback_all": measure(lambda: sum(1 for _ in store.iter_feedback()), max(1, repeat // 2)),
+                "save_profile": measure(lambda: store.save_profile(profile), repeat),
+                "load_profile": measure(store.load_profile, repeat),
+            }
+        out[backend] = rows
+    shutil.rmtree(root, ignore_errors=True)
+    return out
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--quick", action="store_true", help="작은 크기만")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--exact-max", type=int, default=2000, help="exact 탐색을 잴 최대 옷장 크기")
+    ap.add_argument("--only", choices=["recommend", "taste", "storage"], action="append")
+    ap.add_argument("--out", default="", help="결과 JSON (기본 bench/results/pipeline-<git rev>.json)")
+    a = ap.parse_args()
+
+    closet_sizes = [10, 100, 1000] if a.quick else [10, 100, 1000, 10000]
+    feedback_sizes = [100, 1000] if a.quick else [1000, 10000, 100000]
+    only = set(a.only or ["recommend", "taste", "storage"])
+
+    import numpy
+    result = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_rev(),
+        "python": sys.version.split()[0],
+        "numpy": numpy.__version__,
+        "params": {"closet_sizes": closet_sizes, "feedback_sizes": feedback_sizes, "repeat": a.repeat},
+    }
+    if "recommend" in only:
+        result["recommend"] = bench_recommend(closet_sizes, a.exact_max, a.repeat)
+    if "taste" in only:
+        result["taste"] = bench_taste(feedback_sizes, a.repeat)
+    if "storage" in only:
+        result["storage"] = bench_storage(closet_sizes, feedback_sizes, a.repeat)
+
+    out = Path(a.out or ROOT / "bench" / "results" / f"pipeline-{result['git'] or 'local'}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print(f"→ {out}")
+
+if __name__ == "__main__":
+    main()
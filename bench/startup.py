@@ -0,0 +1,91 @@
+"""
+app.py 시작/rerun 시간 측정 (Streamlit AppTest 로 UI 없이 실행)
+
+    python bench/startup.py --runs 5 --reruns 10 --out bench/results/startup.json
+
+- imports: 새 인터프리터에서 모듈 하나씩 import 하는 데 걸린 시간 (median)
+- cold: 새 프로세스에서 app.py 첫 실행 (import + 첫 렌더)
+- warm: 같은 프로세스에서 다시 실행 (Streamlit rerun 과 같음)
+- 외부 API 는 tools/fake_geo_weather.py stub 으로 (네트워크 영향 제외)
+"""
+import argparse, json, os, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tools"))
+
+IMPORTS = ["streamlit", "numpy", "requests", "PIL.Image", "openai",
+           "ootd.scoring", "ootd.storage", "ootd.weather", "ootd.images", "ootd.vision"]
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import {mod}; print(time.perf_counter() - t)"
+
+# 자식 프로세스: cold 1번 + warm 여러 번 → JSON 한 줄
+APP_SNIPPET = """
+import json, sys, time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+cold = time.perf_counter() - t
+assert not at.exception, at.exception
+warm = []
+for _ in range({reruns}):
+    t = time.perf_counter()
+    at.run()
+    warm.append(time.perf_counter() - t)
+heavy = [m for m in ("PIL.Image", "requests", "openai") if m in sys.modules]
+print(json.dumps({{"cold": cold, "warm": warm, "heavy_loaded": heavy}}))
+"""
+
+def _run(code, env, cwd):
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=cwd,
+                         capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()[-1]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5, help="cold 측정 반복(새 프로세스 수)")
+    ap.add_argument("--reruns", type=int, default=10, help="프로세스당 warm rerun 수")
+    ap.add_argument("--out", default="", help="결과 JSON 파일 (없으면 stdout 만)")
+    a = ap.parse_args()
+
+    import fake_geo_weather
+    server, url = fake_geo_weather.serve()
+    work = tempfile.mkdtemp(prefix="ootd_bench_")
+    env = dict(os.environ,
+               PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""),
+               OOTD_NOMINATIM_URL=url, OOTD_OPEN_METEO_URL=url,
+               OOTD_CACHE_DIR=str(Path(work) / "cache"), OPENAI_API_KEY="")
+
+    imports = {}
+    for mod in IMPORTS:
+        try:
+            ts = [float(_run(IMPORT_SNIPPET.format(mod=mod), env, work)) for _ in range(a.runs)]
+            imports[mod] = round(statistics.median(ts) * 1000, 1)
+        except subprocess.CalledProcessError:
+            imports[mod] = None  # 설치 안 됨
+
+    cold, warm, heavy = [], [], set()
+    for _ in range(a.runs):
+        r = json.loads(_run(APP_SNIPPET.format(app=str(ROOT / "app.py"), reruns=a.reruns), env, work))
+        cold.append(r["cold"])
+        warm += r["warm"]
+        heavy |= set(r["heavy_loaded"])
+    server.shutdown()
+
+    result = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "import_ms": imports,
+        "cold_ms": {"median": round(statistics.median(cold) * 1000, 1), "max": round(max(cold) * 1000, 1)},
+        "warm_rerun_ms": {"median": round(statistics.median(warm) * 1000, 1), "max": round(max(warm) * 1000, 1)},
+        "heavy_loaded_after_render": sorted(heavy),
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if a.out:
+        Path(a.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(a.out).write_text(text, encoding="utf-8")
+
+if __name__ == "__main__":
+    main()
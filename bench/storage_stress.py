@@ -0,0 +1,115 @@
+"""
+같은 사용자 저장소에 여러 프로세스 × 스레드가 동시에 저장/삭제 (탭 여러 개 / 세션 여러 개 흉내)
+
+    python bench/storage_stress.py --backend json --procs 4 --threads 4 --ops 50
+    python bench/storage_stress.py --backend sqlite
+
+- 작업자마다 자기 store 를 열고: 아이템 2개 추가 → 1개 삭제, 피드백 append, profile 갱신(update_profile), 중간중간 읽기
+- 끝나고 확인: 남은 아이템 수 / 피드백 수 / profile 카운터가 기대값과 같은지, 깨진 JSON(.corrupt) 이 없는지
+- 하나라도 틀리면 exit code 1
+"""
+import argparse, json, multiprocessing as mp, shutil, sys, tempfile, threading, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from ootd.storage import open_store
+
+def _bump(profile):
+    taste = profile["taste"]
+    taste["rating_count"] = taste.get("rating_count", 0) + 1
+    return profile
+
+def worker(base, backend, tag, ops, errors):
+    store = open_store(Path(base), backend=backend)
+    try:
+        for i in range(ops):
+            keep = {"id": f"{tag}_{i}_keep", "type": "top", "name": "셔츠", "color": "black"}
+            drop = {"id": f"{tag}_{i}_drop", "type": "bottom", "name": "슬랙스", "color": "gray"}
+            store.add_item(keep)
+            store.add_items([drop])
+            store.delete_item(drop["id"])
+            store.append_feedback({"time": f"{tag}_{i}", "rating": 4, "outfit": {"top": keep["id"]}})
+            store.update_profile(_bump)
+            # 읽는 쪽: 잘린 JSON 을 보면 빈 closet 이 나옴 → 방금 넣은 아이템이 없으면 실패
+            if keep["id"] not in {x.get("id") for x in store.load_closet()}:
+                errors.append(f"{tag}: {keep['id']} missing right after add")
+    except Exception as e:
+        errors.append(f"{tag}: {type(e).__name__}: {e}")
+
+def process_main(base, backend, p, threads, ops, queue):
+    errors = []
+    ts = [threading.Thread(target=worker, args=(base, backend, f"p{p}t{t}", ops, errors)) for t in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    queue.put(errors)
+
+def run(backend, procs, threads, ops, base=None):
+    tmp = None
+    if base is None:
+        base = tmp = tempfile.mkdtemp(prefix="ootd_stress_")
+    open_store(Path(base), backend=backend)  # 파일/스키마 먼저 (migration 경합은 따로 보지 않음)
+
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    t0 = time.perf_counter()
+    ps = [ctx.Process(target=process_main, args=(base, backend, p, threads, ops, queue)) for p in range(procs)]
+    for p in ps:
+        p.start()
+    errors = []
+    for _ in ps:
+        errors += queue.get()
+    for p in ps:
+        p.join()
+    elapsed = time.perf_counter() - t0
+
+    store = open_store(Path(base), backend=backend)
+    workers = procs * threads
+    expected = workers * ops
+    closet = store.load_closet()
+    result = {
+        "backend": backend,
+        "procs": procs,
+        "threads": threads,
+        "ops_per_worker": ops,
+        "elapsed_s": round(elapsed, 2),
+        "writes_per_s": round(expected * 5 / elapsed, 1),
+        "items": {"expected": expected, "actual": len(closet)},
+        "unique_items": len({x.get("id") for x in closet}),
+        "feedback": {"expected": expected, "actual": store.count_feedback()},
+        "profile_updates": {"expected": expected, "actual": store.load_profile()["taste"].get("rating_count", 0)},
+        "corrupt_files": [p.name for p in Path(base).glob("*.corrupt-*")],
+        "errors": errors[:20],
+    }
+    result["ok"] = (
+        result["items"]["actual"] == expected == result["unique_items"]
+        and result["feedback"]["actual"] == expected
+        and result["profile_updates"]["actual"] == expected
+        and not result["corrupt_files"]
+        and not errors
+    )
+    if hasattr(store, "close"):
+        store.close()
+    if tmp:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return result
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=["json", "sqlite", "both"], default="both")
+    ap.add_argument("--procs", type=int, default=4)
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--ops", type=int, default=30, help="작업자 1개당 반복 횟수")
+    ap.add_argument("--dir", default=None, help="이 폴더에서 실행 (기본: 임시 폴더, 끝나면 삭제)")
+    a = ap.parse_args()
+
+    backends = ["json", "sqlite"] if a.backend == "both" else [a.backend]
+    results = [run(b, a.procs, a.threads, a.ops, a.dir and str(Path(a.dir) / b)) for b in backends]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
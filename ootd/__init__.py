@@ -0,0 +1,5 @@
+"""
+ootd 코어 모듈 (Streamlit UI 없이 import 가능)
+- vocab: 카테고리/색/패턴/분위기/상황 어휘
+- scoring: 코디 점수 계산 + 추천 엔진
+"""
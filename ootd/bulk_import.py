@@ -0,0 +1,134 @@
+import io, threading, time, zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from .images import make_thumbnails
+from .intent import tag_record
+from .timing import timed
+from .vision import analyze_clothing_image_with_openai, unknown_meta
+
+# =========================
+# Bulk import (여러 장 / zip 한 번에 등록)
+# =========================
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+MAX_ENTRY_BYTES = 25 * 1024 * 1024
+
+def iter_uploads(files):
+    """
+    업로드 파일들 → (이름, bytes)
+    - zip 이면 안의 이미지 파일만 꺼냄 (폴더/숨김파일/__MACOSX/너무 큰 파일 제외)
+    """
+    for f in files:
+        name = getattr(f, "name", "") or ""
+        data = f.getvalue() if hasattr(f, "getvalue") else f.read()
+        if name.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                for info in zf.infolist():
+                    entry = Path(info.filename)
+                    if info.is_dir() or "__MACOSX" in entry.parts or entry.name.startswith("."):
+                        continue
+                    if entry.suffix.lower() not in IMAGE_EXTS or info.file_size > MAX_ENTRY_BYTES:
+                        continue
+                    yield entry.name, zf.read(info)
+        else:
+            yield name, data
+
+class RateLimiter:
+    """초당 rate 회 이하로 호출 간격을 벌림 (여러 스레드 공유)"""
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+def analyze_many(client, blobs, hints=None, max_workers=4, rate=2.0, retries=2, backoff=1.0,
+                 on_progress=None):
+    """
+    Vision 분석을 bounded thread pool 로 동시에
+    - rate: 초당 최대 API 호출 수, retries: 실패 시 재시도 횟수
+    - on_progress(done, total): 호출한 스레드(Streamlit 메인)에서 불림
+    - return: blobs 순서 그대로의 meta 리스트
+    """
+    hints = hints or [""] * len(blobs)
+    results = [unknown_meta() for _ in blobs]
+    if not client or not blobs:
+        if on_progress:
+            on_progress(len(blobs), len(blobs))
+        return results
+
+    limiter = RateLimiter(rate)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(analyze_clothing_image_with_openai, client, b, h,
+                        limiter=limiter, retries=retries, backoff=backoff): i
+            for i, (b, h) in enumerate(zip(blobs, hints))
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            try:
+                results[futures[fut]] = fut.result()
+            except:
+                pass
+            if on_progress:
+                on_progress(done, len(blobs))
+    return results
+
+@timed("bulk_import")
+def import_batch(store, img_dir: Path, uploads, item_type: str, client=None,
+                 primary_style=None, secondary_style=None, on_progress=None, **analyze_kw):
+    """
+    - uploads: iter_uploads() 결과 [(이름, bytes)]
+    - 이미지/썸네일 저장 → Vision 동시 분석 → closet 에는 store.add_items 로 한 번에 기록
+    - return: 새로 추가된 item 리스트 (읽을 수 없는 이미지는 건너뜀)
+    """
+    from PIL import Image
+    img_dir = Path(img_dir)
+    img_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().timestamp()
+
+    saved = []  # (iid, name, bytes, path)
+    for n, (fname, data) in enumerate(uploads):
+        iid = f"item_{stamp}_{n}"
+        img_path = img_dir / f"{iid}.png"
+        try:
+            with Image.open(io.BytesIO(data)) as im:
+                im.save(img_path)
+            make_thumbnails(img_path)
+        except:
+            continue
+        saved.append((iid, Path(fname).stem or item_type, data, img_path))
+
+    metas = analyze_many(client, [s[2] for s in saved], hints=[s[1] for s in saved],
+                         on_progress=on_progress, **analyze_kw)
+
+    now = datetime.now().isoformat()
+    items = []
+    for (iid, name, _, img_path), meta in zip(saved, metas):
+        items.append({
+            "id": iid,
+            "type": item_type,
+            "name": name,
+            "name_tags": tag_record(name),
+            "primary_style": primary_style,
+            "secondary_style": secondary_style,
+            "image": str(img_path),
+            "color": meta.get("color","unknown"),
+            "pattern": meta.get("pattern","unknown"),
+            "warmth": meta.get("warmth","unknown"),
+            "vibe": meta.get("vibe","unknown"),
+            "desc": meta.get("desc",""),
+            "created_at": now,
+            "source": "bulk_import"
+        })
+    if items:
+        store.add_items(items)
+    return items
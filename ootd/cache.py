@@ -0,0 +1,145 @@
+import hashlib, json, os, threading, time
+from collections import OrderedDict
+from pathlib import Path
+
+# =========================
+# Process-wide TTL + LRU cache (옵션: 디스크 tier)
+# =========================
+_MISSING = object()
+
+# 디스크 tier 기본 위치 ("" 이면 메모리만)
+CACHE_DIR = os.environ.get("OOTD_CACHE_DIR", str(Path("data") / "cache"))
+
+def disk_dir(name: str):
+    return Path(CACHE_DIR) / name if CACHE_DIR else None
+
+class TTLCache:
+    """
+    - 메모리: OrderedDict LRU, maxsize 넘으면 가장 오래 안 쓴 것부터 제거
+    - ttl: 초 단위 (None 이면 만료 없음)
+    - disk_dir: 지정하면 JSON 파일로도 저장 → 프로세스 재시작 후에도 재사용
+      (값은 JSON 직렬화 가능해야 함, disk_maxsize 개수 넘으면 오래된 파일부터 삭제)
+    - 여러 Streamlit 세션(스레드)이 같이 쓰므로 lock 으로 보호
+    """
+    def __init__(self, maxsize=256, ttl=600, disk_dir=None, disk_maxsize=2048):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_maxsize = disk_maxsize
+        self.data = OrderedDict()  # key -> (stored_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, stored_at, now):
+        return self.ttl is None or now - stored_at < self.ttl
+
+    def _disk_path(self, key):
+        h = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{h}.json"
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self.lock:
+            hit = self.data.get(key, _MISSING)
+            if hit is not _MISSING:
+                if self._fresh(hit[0], now):
+                    self.data.move_to_end(key)
+                    self.hits += 1
+                    return hit[1]
+                # 만료 항목은 get_stale 용으로 남겨둠 (LRU 로 결국 밀려남)
+
+        if self.disk_dir:
+            try:
+                rec = json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+                if self._fresh(rec["t"], now):
+                    with self.lock:
+                        self._put(key, rec["t"], rec["v"])
+                        self.hits += 1
+                    return rec["v"]
+            except:
+                pass
+
+        with self.lock:
+            self.misses += 1
+        return default
+
+    def get_stale(self, key):
+        """
+        만료 여부 상관없이 마지막으로 저장된 값 → (value, 저장 후 경과 초), 없으면 None
+        - 새로 가져오기에 실패했을 때 stale-while-revalidate 대체값으로 씀
+        """
+        now = time.time()
+        with self.lock:
+            hit = self.data.get(key, _MISSING)
+        if hit is not _MISSING:
+            return hit[1], now - hit[0]
+        if self.disk_dir:
+            try:
+                rec = json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+                return rec["v"], now - rec["t"]
+            except:
+                pass
+        return None
+
+    def _put(self, key, stored_at, value):
+        self.data[key] = (stored_at, value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def set(self, key, value):
+        now = time.time()
+        with self.lock:
+            self._put(key, now, value)
+        if self.disk_dir:
+            try:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+                p = self._disk_path(key)
+                tmp = p.with_name(p.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps({"t": now, "v": value}, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, p)
+                self._prune_disk()
+            except:
+                pass
+
+    def _prune_disk(self):
+        files = list(os.scandir(self.disk_dir))
+        if len(files) <= self.disk_maxsize:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime)
+        for e in files[:len(files) - self.disk_maxsize]:
+            try:
+                os.unlink(e.path)
+            except OSError:
+                pass
+
+    def get_or_set(self, key, fn, cache_if=lambda v: True):
+        """캐시에 없으면 fn() 호출 후 저장 (cache_if 가 False 면 저장 안 함 — 실패값 등)"""
+        v = self.get(key, _MISSING)
+        if v is not _MISSING:
+            return v
+        v = fn()
+        if cache_if(v):
+            self.set(key, v)
+        return v
+
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.data.clear()
+            else:
+                self.data.pop(key, None)
+        if self.disk_dir:
+            try:
+                if key is None:
+                    for e in os.scandir(self.disk_dir):
+                        os.unlink(e.path)
+                else:
+                    self._disk_path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.data)}
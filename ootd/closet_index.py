@@ -0,0 +1,121 @@
+from collections import defaultdict
+
+from .intent import ensure_tags
+from .items import ClosetItem, ColumnarCloset
+
+# =========================
+# In-memory closet index
+# =========================
+FIELDS = ("type", "color", "pattern", "warmth", "vibe")
+
+class ClosetIndex:
+    """
+    closet 리스트를 한 번 읽어서 만드는 조회용 인덱스 (추천/옷장 그리드/삭제가 같이 씀)
+    - items: id → ClosetItem (closet 순서 유지) — dict 대신 slots 레코드로 들고 있음, 내보낼 땐 to_dict
+    - inv[field][value] → id set (type/color/pattern/warmth/vibe)
+    - filter 는 inverted list 교집합 + 등록 순서 정렬 → 전체 리스트 재탐색 X
+    - add/remove 로 저장소와 같이 갱신 (다시 load 안 함)
+    """
+    def __init__(self, closet=()):
+        self.items = {}
+        self.pos = {}
+        self.inv = {f: defaultdict(set) for f in FIELDS}
+        self._next = 0
+        self._columns = None
+        for it in closet:
+            self.add(it)
+
+    @staticmethod
+    def _value(item, field):
+        return item.get(field, None if field == "type" else "unknown")
+
+    def add(self, item):
+        """
+        새 아이템은 맨 뒤에, 같은 id 가 있으면 자리는 그대로 두고 내용만 교체 (store 의 upsert 와 같은 순서)
+        - item: dict 또는 ClosetItem
+        """
+        if not isinstance(item, ClosetItem):
+            # 예전 아이템(이름 태그 없음)은 여기서 1번 채워서 추천 때 이름을 다시 훑지 않게
+            ensure_tags(item)
+            item = ClosetItem.from_dict(item)
+        iid = item.get("id")
+        self._columns = None
+        old = self.items.get(iid)
+        if old is not None:
+            self._unlink(iid, old)
+        else:
+            self.pos[iid] = self._next
+            self._next += 1
+        self.items[iid] = item
+        for f in FIELDS:
+            self.inv[f][self._value(item, f)].add(iid)
+
+    def add_many(self, items):
+        for it in items:
+            self.add(it)
+
+    def _unlink(self, iid, item):
+        for f in FIELDS:
+            ids = self.inv[f].get(self._value(item, f))
+            if ids is not None:
+                ids.discard(iid)
+                if not ids:
+                    del self.inv[f][self._value(item, f)]
+
+    def remove(self, item_id):
+        """삭제된 item 반환 (없으면 None)"""
+        item = self.items.pop(item_id, None)
+        if item is not None:
+            self._columns = None
+            self._unlink(item_id, item)
+            del self.pos[item_id]
+        return item
+
+    def copy(self):
+        """같은 ClosetItem 을 가리키는 새 인덱스 (공유 중인 인덱스를 고치지 않고 바꾼 판을 만들 때)"""
+        new = ClosetIndex.__new__(ClosetIndex)
+        new.items = dict(self.items)
+        new.pos = dict(self.pos)
+        new.inv = {f: defaultdict(set, {v: set(ids) for v, ids in inv.items()}) for f, inv in self.inv.items()}
+        new._next = self._next
+        new._columns = self._columns
+        return new
+
+    def columns(self):
+        """추천 점수 계산용 ColumnarCloset (처음 쓸 때 만들고 add/remove 전까지 재사용)"""
+        if self._columns is None:
+            self._columns = ColumnarCloset.from_items(self.items.values())
+        return self._columns
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        # closet 리스트처럼 등록 순서로
+        return iter(list(self.items.values()))
+
+    def __contains__(self, item_id):
+        return item_id in self.items
+
+    def get(self, item_id):
+        return self.items.get(item_id)
+
+    def values(self, field):
+        """해당 필드에 실제로 있는 값들 (필터 선택지용)"""
+        return [v for v, ids in self.inv[field].items() if ids and v is not None]
+
+    def filter(self, **conds):
+        """
+        filter(type="top", color="black") → 조건 모두 만족하는 ClosetItem 리스트 (등록 순서)
+        - 값이 None 이면 그 조건은 무시
+        """
+        sets = [self.inv[f].get(v, set()) for f, v in conds.items() if v is not None]
+        if not sets:
+            return list(self.items.values())
+        sets.sort(key=len)
+        ids = set(sets[0])
+        for s in sets[1:]:
+            ids &= s
+            if not ids:
+                break
+        return [self.items[i] for i in sorted(ids, key=self.pos.__getitem__)]
@@ -0,0 +1,248 @@
+import json, os, threading
+from pathlib import Path
+
+from .fileio import write_atomic
+
+# =========================
+# Append-only feedback log (JSON Lines)
+# =========================
+def _write_lines_atomic(path: Path, lines):
+    write_atomic(path, b"".join(lines))
+
+def _parse(line: bytes):
+    # 쓰다가 죽어서 잘린 마지막 줄 등은 건너뜀
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+def _count_from(f, offset: int = 0):
+    """열린 파일의 offset 부터 끝까지 줄 수 → (줄 수, 끝 위치)"""
+    f.seek(offset)
+    n = 0
+    for block in iter(lambda: f.read(1 << 16), b""):
+        n += block.count(b"\n")
+    return n, f.tell()
+
+def _count_lines(path: Path):
+    try:
+        with open(path, "rb") as f:
+            return _count_from(f)[0]
+    except FileNotFoundError:
+        return 0
+
+def _open_or_none(path: Path):
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+def _tail_lines(path_or_file, n: int, block_size: int = 8192):
+    """파일 끝에서부터 블록 단위로 거꾸로 읽어 마지막 n줄만 반환 (경로 또는 열린 파일)"""
+    if n <= 0:
+        return []
+    f = _open_or_none(path_or_file) if isinstance(path_or_file, Path) else path_or_file
+    if f is None:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    lines = [ln + b"\n" for ln in buf.split(b"\n") if ln.strip()]
+    return lines[-n:]
+
+class FeedbackLog:
+    """
+    feedback.jsonl (active) + feedback_segments/000001.jsonl ... (compact 결과, 불변)
+    - append: 한 줄 쓰고 fsync → 클릭당 O(1), 중간에 죽어도 앞 기록은 안전
+    - compact: active 앞부분을 새 segment로 옮기고 최근 keep줄만 active에 남김
+    - iter_records / tail: 전체를 메모리에 올리지 않고 스트리밍
+      lock 안에서 segment 목록을 보고 active 를 열어 둠 → compact/rewrite 와 겹쳐도 중복/누락 없음
+    - count: segment 줄 수는 compact 때 counts.json 에 기록, active 는 지난번 위치 뒤만 세서 누적
+      (counts.json 의 gen 은 compact/rewrite 마다 +1 → active 가 교체됐는지 이걸로 판단)
+    - lock: 여러 프로세스가 같은 로그에 쓰면 FileLock 을 넘김 (기본은 프로세스 안 스레드 lock)
+    """
+    def __init__(self, path: Path, max_active_bytes: int = 1 << 20, keep: int = 200, lock=None):
+        self.path = Path(path)
+        self.segment_dir = self.path.with_name(self.path.stem + "_segments")
+        self.max_active_bytes = max_active_bytes
+        self.keep = keep
+        self.lock = lock or threading.Lock()
+        self._compacting = False
+        self._active = None     # ((gen, dev, ino), 센 위치, 줄 수) — active 파일 줄 수 캐시
+        self._meta = None       # (counts.json 의 (mtime_ns, size), {"gen": n, "segments": {이름: 줄 수}})
+
+    @property
+    def counts_path(self):
+        return self.segment_dir / "counts.json"
+
+    def segments(self):
+        if not self.segment_dir.exists():
+            return []
+        return sorted(self.segment_dir.glob("*.jsonl"))
+
+    def _snapshot(self):
+        """(segment 목록, 열린 active 파일 | None) — lock 안에서 같은 시점으로"""
+        with self.lock:
+            return self.segments(), _open_or_none(self.path)
+
+    def append(self, record: dict):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            with open(self.path, "a+b") as f:
+                start = f.seek(0, os.SEEK_END)
+                # 직전 기록이 잘린 채 끝났으면 줄을 끊고 이어 씀
+                if start > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                size = os.fstat(f.fileno()).st_size
+            # 줄 수 캐시가 바로 앞까지 센 상태면 이어서 더함 (아니면 다음 count 때 뒷부분만 셈)
+            cached = self._active
+            if cached is not None and cached[1] == start and size == start + len(line):
+                self._active = (cached[0], size, cached[2] + line.count(b"\n"))
+        if size > self.max_active_bytes:
+            self.compact_in_background()
+
+    def iter_records(self):
+        segs, active = self._snapshot()
+        # segment 는 불변이라 나중에 열어도 같은 내용 (그 사이 rewrite 로 지워졌으면 건너뜀)
+        for f in map(_open_or_none, segs):
+            if f is None:
+                continue
+            with f:
+                yield from self._records(f)
+        if active is not None:
+            with active:
+                yield from self._records(active)
+
+    @staticmethod
+    def _records(f):
+        for line in f:
+            rec = _parse(line)
+            if rec is not None:
+                yield rec
+
+    def tail(self, n: int):
+        """최근 n개 (오래된 것 → 최신 순). active 가 모자라면 최신 segment부터 채움"""
+        segs, active = self._snapshot()
+        lines = _tail_lines(active, n) if active is not None else []
+        for seg in reversed(segs):
+            if len(lines) >= n:
+                break
+            lines = _tail_lines(seg, n - len(lines)) + lines
+        return [r for r in map(_parse, lines) if r is not None]
+
+    def _active_count(self):
+        """active 줄 수 (lock 안에서) — 같은 파일이면 지난번 센 위치 뒤만 읽음"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._active = None
+            return 0
+        key = (self._load_meta()["gen"], st.st_dev, st.st_ino)
+        cached = self._active
+        if cached is None or cached[0] != key or st.st_size < cached[1]:
+            cached = (key, 0, 0)  # compact/rewrite 로 파일이 바뀜 → active 만 다시 셈 (max_active_bytes 이내)
+        if st.st_size > cached[1]:
+            with open(self.path, "rb") as f:
+                n, end = _count_from(f, cached[1])
+            cached = (key, end, cached[2] + n)
+        self._active = cached
+        return cached[2]
+
+    def _load_meta(self):
+        try:
+            st = os.stat(self.counts_path)
+        except FileNotFoundError:
+            return {"gen": 0, "segments": {}}
+        key = (st.st_mtime_ns, st.st_size)
+        if self._meta is None or self._meta[0] != key:
+            try:
+                meta = json.loads(self.counts_path.read_bytes())
+            except ValueError:
+                meta = None
+            if not isinstance(meta, dict) or not {"gen", "segments"} <= meta.keys():
+                meta = {"gen": st.st_mtime_ns, "segments": {}}  # 깨졌으면 segment 는 다시 셈
+            self._meta = (key, meta)
+        return self._meta[1]
+
+    def _save_meta(self, gen, segments):
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.counts_path, json.dumps({"gen": gen, "segments": segments}).encode("utf-8"))
+
+    def _segment_count(self, segs):
+        """segment 줄 수 합 (lock 안에서) — 기록 없는 예전 segment 는 1번 세서 counts.json 에 채움"""
+        meta = self._load_meta()
+        counts = meta["segments"]
+        missing = {p.name: _count_lines(p) for p in segs if p.name not in counts}
+        if missing:
+            counts = dict(counts, **missing)
+            self._save_meta(meta["gen"], counts)
+        return sum(counts[p.name] for p in segs)
+
+    def count(self):
+        with self.lock:
+            return self._segment_count(self.segments()) + self._active_count()
+
+    def rewrite(self, records):
+        """기록 전체 교체 (segment 포함 초기화)"""
+        with self.lock:
+            # 줄 수 기록부터 비움 (segment 이름은 1번부터 다시 쓰므로)
+            self._save_meta(self._load_meta()["gen"] + 1, {})
+            self._active = None
+            for seg in self.segments():
+                seg.unlink()
+            _write_lines_atomic(self.path, [
+                (json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records
+            ])
+
+    def compact(self):
+        """active 의 오래된 줄을 새 segment 파일로 굴림. return: 옮긴 줄 수"""
+        with self.lock:
+            try:
+                lines = [ln for ln in self.path.read_bytes().splitlines(keepends=True) if ln.strip()]
+            except FileNotFoundError:
+                return 0
+            if self.keep:
+                old, recent = lines[:-self.keep], lines[-self.keep:]
+            else:
+                old, recent = lines, []
+            for part in (old, recent):
+                if part and not part[-1].endswith(b"\n"):
+                    part[-1] += b"\n"
+            if not old:
+                return 0
+            self.segment_dir.mkdir(parents=True, exist_ok=True)
+            segs = self.segments()
+            nxt = int(segs[-1].stem) + 1 if segs else 1
+            # segment 먼저 완성 → 그 다음 active 교체 (중간에 죽으면 중복은 생겨도 유실은 없음)
+            seg = self.segment_dir / f"{nxt:06d}.jsonl"
+            _write_lines_atomic(seg, old)
+            meta = self._load_meta()
+            self._save_meta(meta["gen"] + 1, dict(meta["segments"], **{seg.name: len(old)}))
+            self._active = None
+            _write_lines_atomic(self.path, recent)
+            return len(old)
+
+    def compact_in_background(self):
+        with self.lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self.compact()
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,126 @@
+import os, tempfile, threading
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# =========================
+# Atomic write (temp 파일 → rename)
+# =========================
+def fsync_dir(path: Path):
+    # rename 결과까지 디스크에 남기기 (윈도우 등 지원 안 하면 무시)
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def write_atomic(path: Path, data: bytes):
+    """
+    같은 폴더의 임시 파일에 다 쓰고 fsync → os.replace
+    - 읽는 쪽은 항상 예전 파일 전체 아니면 새 파일 전체 (잘린 JSON 없음)
+    - 임시 파일 이름은 쓰는 쪽마다 달라서 동시에 써도 서로 덮지 않음
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    fsync_dir(path.parent)
+
+# =========================
+# Per-user file lock (프로세스 간 + 스레드 간)
+# =========================
+def _lock_fd(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue  # LK_LOCK 은 10초 재시도 후 포기 → 계속 기다림
+
+def _unlock_fd(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+class FileLock:
+    """
+    lock 파일 1개로 거는 배타 lock (같은 스레드 안에서는 재진입 가능)
+    - 같은 경로는 프로세스 안에서 객체 1개 공유 (for_path) → 스레드끼리는 RLock, 프로세스끼리는 flock
+    - read-modify-write(closet 추가/삭제, profile 갱신, 로그 compact)를 이 안에서 하면 동시 저장이 유실되지 않음
+    """
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path: Path):
+        key = os.path.abspath(str(path))
+        with cls._registry_lock:
+            lock = cls._registry.get(key)
+            if lock is None:
+                lock = cls._registry[key] = cls(key)
+            return lock
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._rlock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    _lock_fd(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self._fd = fd
+            except BaseException:
+                self._rlock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock_fd(fd)
+            finally:
+                os.close(fd)
+        self._rlock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
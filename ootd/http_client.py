@@ -0,0 +1,96 @@
+import os, threading, time
+
+# requests 는 첫 호출 때 import (캐시로만 끝나는 rerun/다른 모듈 import 는 안 씀)
+
+# =========================
+# Shared HTTP client (keep-alive pool + endpoint별 timeout/retry + 화면 1번당 시간 예산)
+# =========================
+USER_AGENT = "ootd-streamlit-demo/1.0"
+
+# (connect, read) timeout 초 / 재시도 횟수 / backoff 초 (1회차 backoff, 이후 2배씩)
+# base_url 은 env 로 바꿀 수 있음 → 로컬 stub 서버로 테스트 (tools/fake_geo_weather.py)
+ENDPOINTS = {
+    "nominatim": {
+        "base_url": os.environ.get("OOTD_NOMINATIM_URL", "https://nominatim.openstreetmap.org"),
+        "timeout": (3.05, 5.0), "retries": 1, "backoff": 0.5,
+    },
+    "open-meteo": {
+        "base_url": os.environ.get("OOTD_OPEN_METEO_URL", "https://api.open-meteo.com"),
+        "timeout": (3.05, 5.0), "retries": 2, "backoff": 0.3,
+    },
+}
+
+# 페이지 렌더 1번에서 외부 호출에 쓸 수 있는 총 시간(초)
+RENDER_BUDGET = float(os.environ.get("OOTD_HTTP_BUDGET", "4.0"))
+
+class BudgetExceeded(Exception):
+    pass
+
+class Budget:
+    """렌더 1번 동안 공유하는 마감 시각 — 호출마다 남은 시간만큼만 timeout 을 줌"""
+    def __init__(self, seconds: float = None):
+        self.seconds = RENDER_BUDGET if seconds is None else seconds
+        self.deadline = time.monotonic() + self.seconds
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """프로세스 전체에서 같이 쓰는 Session (호스트별 연결 재사용, 재시도는 request_json 에서 직접)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["User-Agent"] = USER_AGENT
+                _session = s
+    return _session
+
+def _timeout(conf, budget):
+    connect, read = conf["timeout"]
+    if budget is None:
+        return (connect, read)
+    left = budget.remaining()
+    if left <= 0:
+        raise BudgetExceeded(f"budget {budget.seconds}s exceeded")
+    return (min(connect, left), min(read, left))
+
+def get_json(endpoint: str, path: str, params=None, budget: Budget = None):
+    """
+    ENDPOINTS[endpoint] 설정으로 GET → JSON
+    - 연결 실패/timeout/5xx/429 는 backoff 후 재시도, 4xx 는 바로 실패
+    - budget 이 있으면 남은 시간 안에서만 시도 (다 쓰면 BudgetExceeded)
+    """
+    import requests
+    conf = ENDPOINTS[endpoint]
+    url = conf["base_url"].rstrip("/") + path
+    last = None
+    for attempt in range(conf["retries"] + 1):
+        if attempt:
+            wait = conf["backoff"] * (2 ** (attempt - 1))
+            if budget is not None and wait >= budget.remaining():
+                break
+            time.sleep(wait)
+        try:
+            r = get_session().get(url, params=params, timeout=_timeout(conf, budget))
+            if r.status_code == 429 or r.status_code >= 500:
+                last = requests.HTTPError(f"{r.status_code} from {endpoint}", response=r)
+                continue
+            r.raise_for_status()
+            return r.json()
+        except (requests.ConnectionError, requests.Timeout) as e:
+            last = e
+    if budget is not None and budget.expired():
+        raise BudgetExceeded(f"{endpoint}: budget {budget.seconds}s exceeded") from last
+    raise last or BudgetExceeded(f"{endpoint}: no time left to retry")
@@ -0,0 +1,211 @@
+import os, threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from .timing import timed
+
+# PIL 은 실제로 그리거나 축소할 때만 import (이미 만든 썸네일만 보여주는 rerun 은 안 씀)
+
+# =========================
+# Placeholder image generator
+# =========================
+@lru_cache(maxsize=8)
+def _get_font(size: int):
+    # 폰트 파일은 프로세스당 사이즈별 1번만 로드
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except:
+        return ImageFont.load_default()
+
+def draw_simple_icon(draw, category: str, x: int, y: int, w: int, h: int):
+    stroke = (220, 220, 220)
+    fill = (50, 50, 50)
+    if category == "top":
+        draw.rectangle([x+w*0.30, y+h*0.30, x+w*0.70, y+h*0.85], outline=stroke, width=4, fill=fill)
+        draw.polygon([(x+w*0.30, y+h*0.35), (x+w*0.18, y+h*0.48), (x+w*0.30, y+h*0.55)],
+                     outline=stroke, fill=fill)
+        draw.polygon([(x+w*0.70, y+h*0.35), (x+w*0.82, y+h*0.48), (x+w*0.70, y+h*0.55)],
+                     outline=stroke, fill=fill)
+    elif category == "bottom":
+        draw.rectangle([x+w*0.35, y+h*0.30, x+w*0.65, y+h*0.85], outline=stroke, width=4, fill=fill)
+        draw.line([x+w*0.50, y+h*0.30, x+w*0.50, y+h*0.85], fill=stroke, width=3)
+        draw.rectangle([x+w*0.35, y+h*0.85, x+w*0.47, y+h*0.95], outline=stroke, width=4, fill=fill)
+        draw.rectangle([x+w*0.53, y+h*0.85, x+w*0.65, y+h*0.95], outline=stroke, width=4, fill=fill)
+    elif category == "outer":
+        draw.rectangle([x+w*0.32, y+h*0.25, x+w*0.68, y+h*0.95], outline=stroke, width=4, fill=fill)
+        draw.line([x+w*0.50, y+h*0.25, x+w*0.50, y+h*0.95], fill=stroke, width=3)
+        draw.polygon([(x+w*0.32, y+h*0.25), (x+w*0.40, y+h*0.42), (x+w*0.50, y+h*0.25)],
+                     outline=stroke, fill=fill)
+        draw.polygon([(x+w*0.68, y+h*0.25), (x+w*0.60, y+h*0.42), (x+w*0.50, y+h*0.25)],
+                     outline=stroke, fill=fill)
+    elif category == "shoes":
+        draw.rounded_rectangle([x+w*0.25, y+h*0.60, x+w*0.80, y+h*0.78], radius=18,
+                               outline=stroke, width=4, fill=fill)
+        draw.rounded_rectangle([x+w*0.25, y+h*0.75, x+w*0.82, y+h*0.86], radius=18,
+                               outline=stroke, width=4, fill=fill)
+
+@lru_cache(maxsize=16)
+def _placeholder_base(category: str, size=(640, 640)):
+    """이름만 뺀 카테고리별 템플릿 (프로세스당 1번 그림) — 꺼내 쓸 때는 copy()"""
+    from PIL import Image, ImageDraw
+    img = Image.new("RGB", size, (24, 24, 24))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle([24, 18, size[0]-24, 82], radius=22, fill=(36, 36, 36))
+    font_small = _get_font(20)
+    draw.text((44, 38), f"ootd • {category}", fill=(230, 230, 230), font=font_small)
+
+    icon_box = (60, 120, size[0]-60, 420)
+    draw.rounded_rectangle(icon_box, radius=34, fill=(30, 30, 30), outline=(70, 70, 70), width=2)
+    x1, y1, x2, y2 = icon_box
+    draw_simple_icon(draw, category, x1, y1, x2-x1, y2-y1)
+
+    draw.rounded_rectangle([60, size[1]-120, size[0]-60, size[1]-58], radius=26, fill=(79, 127, 255))
+    draw.text((80, size[1]-105), "auto-generated", fill=(255, 255, 255), font=font_small)
+    return img
+
+def render_placeholder(name: str, category: str, size=(640, 640)):
+    from PIL import ImageDraw
+    img = _placeholder_base(category, size).copy()
+    nm = (name or "item").strip() or "item"
+    ImageDraw.Draw(img).text((60, 450), nm[:28], fill=(245, 245, 245), font=_get_font(28))
+    return img
+
+def make_placeholder_image(name: str, category: str, out_path: Path, size=(640, 640)):
+    render_placeholder(name, category, size).save(out_path)
+
+@lru_cache(maxsize=128)
+def virtual_placeholder(name: str, category: str, size_name: str = "grid"):
+    """
+    파일 없이 (category, name) 으로 바로 그린 표시용 이미지 (사이즈별 축소, 작은 LRU)
+    - 반환 이미지는 캐시 공유 객체라 수정하지 말 것
+    """
+    from PIL import Image
+    img = render_placeholder(name, category)
+    px = THUMB_SIZES.get(size_name)
+    if px:
+        img.thumbnail((px, px), Image.LANCZOS)
+    return img
+
+# =========================
+# Thumbnails (원본은 재분석용으로 그대로 두고 표시용 축소본만 생성)
+# =========================
+# 긴 변 기준 px (grid: 옷장 4열, card: 추천 카드 width=220 의 2배 → 레티나 대응)
+THUMB_SIZES = {"grid": 360, "card": 440}
+
+# (원본 경로, size) → 확인된 축소본 경로 (프로세스 전체 공유, 작은 LRU)
+# → 한 번 확인한 아이템은 rerun/다른 세션에서 축소본 stat 1번으로 반환 (원본 stat/확장자 탐색 생략)
+#   만들 때 채우고 지울 때 뺌. 다른 프로세스가 지운 경우는 stat 에서 걸러서 다시 확인
+THUMB_MEMO_MAX = 4096
+_thumb_memo = OrderedDict()
+_thumb_memo_lock = threading.Lock()
+
+def _memo_get(image_path, size_name: str):
+    key = (str(image_path), size_name)
+    with _thumb_memo_lock:
+        hit = _thumb_memo.get(key)
+        if hit is not None:
+            _thumb_memo.move_to_end(key)
+        return hit
+
+def _memo_set(image_path, paths: dict):
+    with _thumb_memo_lock:
+        for name, p in paths.items():
+            _thumb_memo[(str(image_path), name)] = str(p)
+        while len(_thumb_memo) > THUMB_MEMO_MAX:
+            _thumb_memo.popitem(last=False)
+
+def thumb_path(image_path, size_name: str, ext: str = ".webp") -> Path:
+    p = Path(image_path)
+    return p.parent / "thumbs" / f"{p.stem}_{size_name}{ext}"
+
+def _save_thumb(img, image_path, size_name: str):
+    out = thumb_path(image_path, size_name)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        img.save(out, "WEBP", quality=80, method=4)
+        return out
+    except (KeyError, OSError):
+        # WebP 미지원 Pillow 빌드면 JPEG 으로
+        out = thumb_path(image_path, size_name, ".jpg")
+        img.save(out, "JPEG", quality=82, optimize=True)
+        return out
+
+@timed("images.thumbnails")
+def make_thumbnails(image_path, sizes=None):
+    """
+    원본 1번 열어서 사이즈별 축소본 생성 (EXIF 회전 반영, 투명 배경은 흰색으로)
+    - return: {size_name: path}
+    """
+    from PIL import Image, ImageOps
+    sizes = sizes or THUMB_SIZES
+    out = {}
+    with Image.open(image_path) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode in ("RGBA", "LA", "P"):
+            im = im.convert("RGBA")
+            bg = Image.new("RGB", im.size, (255, 255, 255))
+            bg.paste(im, mask=im.split()[-1])
+            im = bg
+        elif im.mode != "RGB":
+            im = im.convert("RGB")
+        # 큰 사이즈부터 줄여가며 재사용
+        for name, px in sorted(sizes.items(), key=lambda x: -x[1]):
+            im.thumbnail((px, px), Image.LANCZOS)
+            out[name] = _save_thumb(im, image_path, name)
+    _memo_set(image_path, out)
+    return out
+
+def _existing_thumb(image_path, size_name: str):
+    for ext in (".webp", ".jpg"):
+        p = thumb_path(image_path, size_name, ext)
+        if p.exists():
+            return p
+    return None
+
+def thumbnail_for(image_path, size_name: str = "grid"):
+    """
+    표시용 경로 반환. 축소본이 없거나 원본보다 오래됐으면 그때 생성 (기존 아이템 lazy backfill)
+    - 실패하면 원본 경로 그대로
+    """
+    if not image_path:
+        return image_path
+    hit = _memo_get(image_path, size_name)
+    if hit is not None:
+        if os.path.exists(hit):
+            return hit
+        _memo_drop(image_path)
+    try:
+        src = Path(image_path)
+        t = _existing_thumb(src, size_name)
+        if t and t.stat().st_mtime >= src.stat().st_mtime:
+            _memo_set(image_path, {size_name: t})
+            return str(t)
+        return str(make_thumbnails(src)[size_name])
+    except:
+        return image_path
+
+def _memo_drop(image_path):
+    with _thumb_memo_lock:
+        for name in THUMB_SIZES:
+            _thumb_memo.pop((str(image_path), name), None)
+
+def delete_derivatives(image_path):
+    _memo_drop(image_path)
+    for name in THUMB_SIZES:
+        for ext in (".webp", ".jpg"):
+            try:
+                thumb_path(image_path, name, ext).unlink()
+            except OSError:
+                pass
+
+@timed("images.display")
+def display_image(item: dict, size_name: str = "grid"):
+    """
+    화면 표시용: 사진(또는 placeholder 파일)이 있으면 축소본 경로,
+    파일 없이 저장된 아이템(가상 placeholder)은 (category, name) 으로 렌더링한 이미지
+    """
+    if item.get("image"):
+        return thumbnail_for(item["image"], size_name)
+    return virtual_placeholder(item.get("name", ""), item.get("type", ""), size_name)
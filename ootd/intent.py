@@ -0,0 +1,103 @@
+import hashlib, re
+from functools import lru_cache
+
+from .vocab import SITUATIONS
+
+# =========================
+# Situation → intent record (상황 문자열은 import 시점에 1번만 해석)
+# =========================
+# scoring.item_rules 의 격식/편함/운동/데이트 판단
+FORMAL_SITUATIONS = ["면접","발표","중요","출근","미팅","결혼식","장례식"]
+COMFY_SITUATIONS = ["집콕","학교","꾸안꾸","근처","수업"]
+SPORTY_SITUATIONS = ["운동","러닝"]
+DATE_SITUATIONS = ["데이트","소개팅","첫만남"]
+
+# 상황 → 목표 vibe (vibe_fit_score / 코디 조합 점수)
+VIBE_RULES = [
+    (["면접","발표","중요","출근","미팅","결혼식","장례식"], {"formal","minimal","dandy"}),
+    (["데이트","소개팅","첫만남"], {"dandy","minimal","cute"}),
+    (["운동","러닝"], {"sporty"}),
+    (["학교","수업","꾸안꾸","집콕","근처 마실"], {"casual","minimal"}),
+    (["여행","나들이"], {"casual","street","minimal"}),
+]
+
+class SituationIntent:
+    """상황 1개의 해석 결과 (formal/comfy/sporty/date 플래그 + 목표 vibe)"""
+    __slots__ = ("formal", "comfy", "sporty", "date", "desired")
+
+    def __init__(self, situation: str):
+        def has(words):
+            return any(x in situation for x in words)
+        self.formal = has(FORMAL_SITUATIONS)
+        self.comfy = has(COMFY_SITUATIONS)
+        self.sporty = has(SPORTY_SITUATIONS)
+        self.date = has(DATE_SITUATIONS)
+        self.desired = frozenset(v for words, vibes in VIBE_RULES if has(words) for v in vibes)
+
+    def __repr__(self):
+        flags = [f for f in ("formal", "comfy", "sporty", "date") if getattr(self, f)]
+        return f"SituationIntent({flags}, desired={sorted(self.desired)})"
+
+@lru_cache(maxsize=256)
+def _compile_intent(situation: str):
+    return SituationIntent(situation)
+
+# 선택지(SITUATIONS)는 미리 만들어 둠 → 추천 때는 dict 조회 1번
+INTENTS = {s: _compile_intent(s) for s in SITUATIONS}
+
+def situation_intent(situation: str) -> SituationIntent:
+    it = INTENTS.get(situation)
+    return it if it is not None else _compile_intent(situation or "")
+
+# =========================
+# Item name → keyword tags (저장 시점에 1번, 정규식 1개로)
+# =========================
+NAME_KEYWORDS = {
+    "formal": ["셔츠","슬랙","코트","자켓","블레이저","로퍼"],
+    "casual": ["후드","트랙","조거","볼캡"],
+    "date": ["셔츠","니트","코트","자켓","로퍼","가디건"],
+    "comfy": ["후드","맨투맨","티","청바지","가디건","스니커"],
+    "sporty": ["운동","트레이닝","러닝","조거","스니커"],
+}
+
+# 키워드 목록이 바뀌면 저장된 태그는 버전이 달라져서 다시 계산
+TAGS_VERSION = hashlib.sha1(repr(sorted(NAME_KEYWORDS.items())).encode("utf-8")).hexdigest()[:8]
+
+def _build_matcher():
+    """
+    모든 키워드를 긴 것부터 alternation 으로 묶고 lookahead 로 위치마다 1번씩 매칭
+    - 한 위치에선 가장 긴 키워드만 잡히므로, 키워드별 태그에 그 안에 포함된 짧은 키워드의 태그까지 합쳐 둠
+      → 결과가 키워드마다 `k in name` 을 돌린 것과 같음
+    """
+    words = sorted({w for ws in NAME_KEYWORDS.values() for w in ws}, key=len, reverse=True)
+    tags = {k: frozenset(t for t, ws in NAME_KEYWORDS.items() for w in ws if w in k) for k in words}
+    return re.compile("(?=(" + "|".join(map(re.escape, words)) + "))"), tags
+
+_MATCHER, _KEYWORD_TAGS = _build_matcher()
+
+@lru_cache(maxsize=4096)
+def name_tags(name: str) -> frozenset:
+    """이름 → {"formal", "casual", "date", "comfy", "sporty"} 중 해당 태그"""
+    found = set()
+    for m in _MATCHER.finditer(name or ""):
+        found |= _KEYWORD_TAGS[m.group(1)]
+    return frozenset(found)
+
+def tag_record(name: str):
+    """item["name_tags"] 로 저장하는 값"""
+    return {"v": TAGS_VERSION, "tags": sorted(name_tags(name))}
+
+def ensure_tags(item: dict):
+    """태그가 없거나 예전 버전이면 채움 (메모리에서만, 다음 저장 때 같이 기록됨) → 바뀌었으면 True"""
+    rec = item.get("name_tags")
+    if rec and rec.get("v") == TAGS_VERSION:
+        return False
+    item["name_tags"] = tag_record(item.get("name", "") or "")
+    return True
+
+def item_tags(item):
+    """저장된 태그 list(버전 같을 때) 또는 이름에서 바로 계산한 frozenset (예전 아이템) — `in` 으로만 씀"""
+    rec = item.get("name_tags")
+    if rec and rec.get("v") == TAGS_VERSION:
+        return rec["tags"]
+    return name_tags(item.get("name", "") or "")
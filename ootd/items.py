@@ -0,0 +1,180 @@
+import sys
+
+import numpy as np
+
+from .intent import TAGS_VERSION
+from .vocab import CATEGORIES, COLORS, PATTERNS, WARMTH, VIBES
+
+# =========================
+# Compact closet item (__slots__ + 작은 정수 코드)
+# =========================
+# 저장 JSON 스키마는 그대로, 메모리에서만 카테고리형 값을 어휘 index 로
+CAT_FIELDS = ("type", "color", "pattern", "warmth", "vibe")
+STR_FIELDS = ("id", "name", "primary_style", "secondary_style", "image", "desc", "created_at", "source")
+# to_dict 키 순서 (app.py / bulk_import 가 저장하는 순서와 같게)
+FIELD_ORDER = ("id", "type", "name", "name_tags", "primary_style", "secondary_style", "image",
+               "color", "pattern", "warmth", "vibe", "desc", "created_at", "source")
+# 값 종류가 몇 개 안 되는 문자열 필드 → 아이템끼리 같은 str 객체 공유
+_INTERN = ("primary_style", "secondary_style", "source")
+
+# 어휘(vocab.py) 값은 어휘 index 그대로 → compiled taste 배열을 코드로 바로 조회
+VOCAB_BASE = {
+    "type": CATEGORIES,
+    "color": COLORS,
+    "pattern": PATTERNS,
+    "warmth": WARMTH,
+    "vibe": VIBES,
+}
+
+_BASE_IDS = {f: {v: i for i, v in enumerate(vs)} for f, vs in VOCAB_BASE.items()}
+
+_ABSENT = object()  # 원래 dict 에 키가 없었음 (unknown 취급, to_dict 에서도 뺌)
+
+# 현재 버전 name_tags 의 태그 tuple (태그 조합은 몇 개 안 됨 → 같은 tuple 공유)
+_TAG_TUPLES = {}
+
+class Vocab:
+    """
+    값 ↔ 정수 코드 (ColumnarCloset 1개 전용)
+    - 어휘 값은 0..base_size-1, 어휘 밖 값(None, "", 예전 데이터 등)은 처음 볼 때 뒤에 새 코드
+    - 옷장마다 따로 두므로 어휘 밖 값이 프로세스 전체에 쌓이지 않음 (옷장이 없어지면 같이 없어짐)
+    """
+    def __init__(self, base):
+        self.values = list(base)
+        self.ids = {v: i for i, v in enumerate(self.values)}
+        self.base_size = len(self.values)
+
+    def code(self, v):
+        c = self.ids.get(v)
+        if c is None:
+            c = self.ids[v] = len(self.values)
+            self.values.append(v)
+        return c
+
+    def table(self, fn, dtype=np.int64):
+        """코드 → fn(값) 조회 배열 (코드 배열로 fancy indexing 해서 벡터 계산)"""
+        return np.array([fn(v) for v in self.values], dtype=dtype)
+
+def known(v):
+    """scoring 의 `v and v != "unknown"` 과 같은 기준 (키 없음 → unknown 취급)"""
+    return v is not _ABSENT and bool(v) and v != "unknown"
+
+def _encode_cat(field, v):
+    # 어휘 값 → 어휘 index(int), 어휘 밖 값은 그대로 (str 이면 intern, int/tuple 은 코드와 안 헷갈리게 1-tuple)
+    if isinstance(v, str):
+        c = _BASE_IDS[field].get(v)
+        return sys.intern(v) if c is None else c
+    if type(v) in (int, tuple):
+        return (v,)
+    return v
+
+def _decode_cat(field, v):
+    t = type(v)
+    if t is int:
+        return VOCAB_BASE[field][v]
+    return v[0] if t is tuple else v
+
+class ClosetItem:
+    """
+    옷장 아이템 1개 (ClosetIndex / 공유 캐시가 아이템마다 dict 대신 들고 있는 것)
+    - 카테고리형 필드는 어휘 index(int), 어휘 밖 값만 원래 값 그대로
+    - name_tags 는 현재 버전이면 태그 tuple 만 (같은 조합은 공유)
+    - dict 처럼 get / [] 로 읽기만, 저장/결과로 내보낼 땐 to_dict
+    - ClosetItem.from_dict(d).to_dict() == d (스키마 밖 키는 extra 에 보관)
+    """
+    __slots__ = CAT_FIELDS + STR_FIELDS + ("name_tags", "extra")
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        it = cls.__new__(cls)
+        for f in CAT_FIELDS:
+            setattr(it, f, _encode_cat(f, d.get(f, _ABSENT)))
+        for f in STR_FIELDS:
+            v = d.get(f, _ABSENT)
+            if f in _INTERN and isinstance(v, str):
+                v = sys.intern(v)
+            setattr(it, f, v)
+        rec = d.get("name_tags", _ABSENT)
+        if isinstance(rec, dict) and rec.keys() == {"v", "tags"} and rec["v"] == TAGS_VERSION \
+                and isinstance(rec["tags"], list):
+            tags = tuple(rec["tags"])
+            rec = _TAG_TUPLES.setdefault(tags, tags)
+        it.name_tags = rec
+        extra = {k: v for k, v in d.items() if k not in FIELD_ORDER}
+        it.extra = extra or None
+        return it
+
+    def get(self, field, default=None):
+        if field in CAT_FIELDS:
+            v = _decode_cat(field, getattr(self, field))
+        elif field in STR_FIELDS:
+            v = getattr(self, field)
+        elif field == "name_tags":
+            v = self.name_tags
+            if type(v) is tuple:
+                v = {"v": TAGS_VERSION, "tags": list(v)}
+        else:
+            v = (self.extra or {}).get(field, _ABSENT)
+        return default if v is _ABSENT else v
+
+    def __getitem__(self, field):
+        v = self.get(field, _ABSENT)
+        if v is _ABSENT:
+            raise KeyError(field)
+        return v
+
+    def to_dict(self):
+        """저장 스키마 dict (새로 만든 dict → 고쳐도 캐시된 아이템은 그대로)"""
+        d = {}
+        for f in FIELD_ORDER:
+            v = self.get(f, _ABSENT)
+            if v is not _ABSENT:
+                d[f] = v
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __repr__(self):
+        return f"ClosetItem({self.to_dict()!r})"
+
+# =========================
+# Columnar closet (카테고리형 값 → 작은 정수 코드)
+# =========================
+class ColumnarCloset:
+    """
+    옷장 전체를 컬럼으로: codes[field] = int32 배열 (행 = 등록 순서), ids = 행별 id
+    - 추천 점수 계산은 행 index 배열로 컬럼을 한 번에 gather (아이템을 돌지 않음)
+    - ClosetItem 은 복사하지 않고 ClosetIndex 가 가진 것을 그대로 참조 (결과 후보를 만들 때만 꺼냄)
+    - vocabs[field]: 이 옷장의 코드표 (만든 뒤에는 바뀌지 않음 → 여러 세션이 같이 읽어도 안전)
+    """
+    @classmethod
+    def from_items(cls, items):
+        """ClosetItem 들 → 컬럼 (어휘 index 는 그대로 코드, 어휘 밖 값만 이 옷장 vocab 에 추가)"""
+        items = list(items)
+        cols = cls.__new__(cls)
+        cols.items = items
+        cols.ids = [it.get("id") for it in items]
+        cols.vocabs = {f: Vocab(VOCAB_BASE[f]) for f in CAT_FIELDS}
+        cols.memo = {}  # 이 옷장에서만 유효한 계산 결과 (scoring.item_features 등)
+        cols.codes = {}
+        for f in CAT_FIELDS:
+            code = cols.vocabs[f].code
+            cols.codes[f] = np.fromiter(
+                (v if type(v) is int else code(_decode_cat(f, v)) for v in (getattr(it, f) for it in items)),
+                dtype=np.int32, count=len(items),
+            )
+        return cols
+
+    def __len__(self):
+        return len(self.ids)
+
+    def item(self, row):
+        """row → ClosetItem (추천 결과처럼 몇 개만 꺼낼 때)"""
+        return self.items[row]
+
+    def rows_of(self, field, value):
+        """field == value 인 행 index (등록 순서)"""
+        code = self.vocabs[field].ids.get(value)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self.codes[field] == code)
@@ -0,0 +1,23 @@
+import os
+from functools import lru_cache
+
+# =========================
+# OpenAI client (프로세스 전체 공유)
+# =========================
+@lru_cache(maxsize=8)
+def _make_client(api_key: str, base_url):
+    from openai import OpenAI  # 무거운 import 는 처음 쓸 때 1번만
+    # SDK 자체 재시도는 끔 — 재시도/backoff/rate limit 은 호출하는 쪽(vision/bulk_import, rerank timeout)이 1곳에서 관리
+    return OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+
+def get_client(api_key: str):
+    """
+    (키, OPENAI_BASE_URL) 별로 1번만 만든 client 재사용 → rerun/세션마다 새로 만들지 않음 (연결 pool 도 유지)
+    - openai 패키지가 없거나 생성 실패면 None
+    """
+    if not api_key:
+        return None
+    try:
+        return _make_client(api_key, os.environ.get("OPENAI_BASE_URL") or None)
+    except:
+        return None
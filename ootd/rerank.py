@@ -0,0 +1,170 @@
+import hashlib, json, os, re, time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from .cache import TTLCache, disk_dir
+
+# =========================
+# AI rerank (추천 마지막 단계, 선택)
+# =========================
+RERANK_MODEL = "gpt-4.1-mini"
+
+# USD / 1M tokens (input, output) — 클릭별 비용 표시용
+PRICES = {"gpt-4.1-mini": (0.40, 1.60)}
+
+# 1등-2등 점수 차가 이 이상이면 규칙 점수로 충분 → LLM 호출 안 함
+CONFIDENCE_GAP = float(os.environ.get("OOTD_RERANK_GAP", "3"))
+# 같은 입력(날씨 구간/상황/취향 요약/후보)이면 이 시간 동안 예전 응답 재사용
+RERANK_TTL = int(os.environ.get("OOTD_RERANK_TTL", str(30 * 60)))
+# 백그라운드 리랭크를 기다리는 최대 시간(초) — 넘으면 규칙 점수 1순위 그대로
+RERANK_TIMEOUT = float(os.environ.get("OOTD_RERANK_TIMEOUT", "8"))
+
+PROMPT_TEMPLATE = """
+너는 OOTD 코디 선택 심사위원이야.
+아래 "사용자 취향 요약"을 강하게 반영해서, 날씨/상황에 가장 적합한 후보 1개를 골라.
+반환은 JSON만.
+
+- 날씨: {weather}
+- 상황: {situation}
+- 사용자 취향 요약: {taste_summary}
+- 후보: {candidates}
+
+반환:
+{{"best_id":"c1","why":"짧게 1~2문장"}}
+"""
+
+PROMPT_VERSION = hashlib.sha1((RERANK_MODEL + PROMPT_TEMPLATE).encode("utf-8")).hexdigest()[:12]
+
+def taste_summary(profile: dict):
+    taste = profile.get("taste", {})
+    return {
+        f"{b}_top": sorted(taste.get(b, {}).items(), key=lambda x: x[1], reverse=True)[:5]
+        for b in ("color_pref", "color_avoid", "pattern_pref", "pattern_avoid", "vibe_pref", "vibe_avoid")
+    }
+
+def simplify_candidates(candidates):
+    simplified = []
+    for c in candidates[:6]:
+        outfit = c["outfit"]
+        simplified.append({
+            "id": c["id"],
+            "score": c["score"],
+            "items": {k: {
+                "name": outfit[k].get("name"),
+                "type": outfit[k].get("type"),
+                "color": outfit[k].get("color"),
+                "pattern": outfit[k].get("pattern"),
+                "warmth": outfit[k].get("warmth"),
+                "vibe": outfit[k].get("vibe"),
+            } for k in outfit.keys()}
+        })
+    return simplified
+
+def weather_bucket(weather: dict):
+    """캐시 키용: 2°C 구간 + 날씨 코드 (측정 시각/풍속 소수점 차이로 캐시가 깨지지 않게)"""
+    t = weather.get("temperature")
+    return (None if t is None else int(t // 2) * 2, weather.get("weathercode"))
+
+def rerank_fingerprint(weather, situation, profile, candidates):
+    """후보는 c-id 가 아니라 (슬롯, 아이템 id) 로 → 옷장 순서가 바뀌어도 같은 후보면 같은 키"""
+    key = {
+        "v": PROMPT_VERSION,
+        "weather": weather_bucket(weather),
+        "situation": situation,
+        "taste": taste_summary(profile),
+        "candidates": [sorted((k, it.get("id")) for k, it in c["outfit"].items()) for c in candidates[:6]],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def _usage_cost(resp):
+    usage = getattr(resp, "usage", None)
+    tin = int(getattr(usage, "input_tokens", 0) or 0)
+    tout = int(getattr(usage, "output_tokens", 0) or 0)
+    p_in, p_out = PRICES.get(RERANK_MODEL, (0.0, 0.0))
+    return tin, tout, (tin * p_in + tout * p_out) / 1_000_000
+
+rerank_cache = TTLCache(maxsize=512, ttl=RERANK_TTL, disk_dir=disk_dir("rerank"))
+# 백그라운드 리랭크용 (프로세스 전체 공유)
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ootd-rerank")
+
+class Reranker:
+    """
+    recommend(rerank=...) 에 넘기는 callable. 클릭 1번에 1개 만들어서 쓰고 stats 를 화면에 표시
+    - 후보 1·2등 점수 차 >= gap → 호출 생략 (source="gate")
+    - 같은 fingerprint 응답이 캐시에 있으면 재사용 (source="cache")
+    - stats: {"source", "latency_ms", "input_tokens", "output_tokens", "cost_usd", "gap"}
+    - submit()/result(): 백그라운드로 돌리고 timeout 초 안에 안 오면 None (source="timeout")
+    """
+    def __init__(self, client, gap: float = None, cache: TTLCache = rerank_cache, timeout: float = None):
+        self.client = client
+        self.gap = CONFIDENCE_GAP if gap is None else gap
+        self.cache = cache
+        self.timeout = RERANK_TIMEOUT if timeout is None else timeout
+        self.stats = {}
+        self._submitted_at = None
+
+    def submit(self, weather, situation, profile, candidates):
+        """바로 Future 반환 (규칙 점수 1순위를 먼저 보여주고 result() 로 나중에 받기)"""
+        self._submitted_at = time.monotonic()
+        return _pool.submit(self, weather, situation, profile, candidates)
+
+    def result(self, future):
+        """submit 시점부터 timeout 초까지만 기다림. 늦으면 None — 응답은 도착하면 캐시에는 남음"""
+        left = self.timeout - (time.monotonic() - self._submitted_at)
+        try:
+            return future.result(timeout=max(0.0, left))
+        except TimeoutError:
+            self.stats = {"source": "timeout", "latency_ms": round(self.timeout * 1000, 1),
+                          "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "gap": None}
+            return None
+        except:
+            return None
+
+    def __call__(self, weather, situation, profile, candidates):
+        t0 = time.perf_counter()
+        # 이번 호출 전용 dict (timeout 뒤에 늦게 끝나도 화면에 보여준 stats 를 덮어쓰지 않게)
+        stats = self.stats = {"source": None, "latency_ms": 0.0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+                      "gap": candidates[0]["score"] - candidates[1]["score"] if len(candidates) > 1 else None}
+        try:
+            if not self.client or not candidates:
+                return None
+            if stats["gap"] is None or stats["gap"] >= self.gap:
+                stats["source"] = "gate"
+                return None
+
+            key = rerank_fingerprint(weather, situation, profile, candidates)
+            hit = self.cache.get(key)
+            if hit is not None:
+                stats["source"] = "cache"
+            else:
+                hit = self._request(weather, situation, profile, candidates, stats)
+                if hit is None:
+                    stats["source"] = "error"
+                    return None
+                stats["source"] = "llm"
+                self.cache.set(key, hit)
+            # 캐시에는 순위(0~5)로 저장 → 이번 후보 id 로 되돌림
+            return {"best_id": candidates[hit["rank"]]["id"], "why": hit["why"]}
+        finally:
+            stats["latency_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    def _request(self, weather, situation, profile, candidates, stats):
+        prompt = PROMPT_TEMPLATE.format(
+            weather=weather, situation=situation,
+            taste_summary=taste_summary(profile), candidates=simplify_candidates(candidates)
+        ).strip()
+        try:
+            # SDK 재시도 없이 1번만 → timeout 이 백그라운드 작업 전체 시간의 상한 (pool 슬롯을 오래 안 잡음)
+            api = self.client.with_options(max_retries=0, timeout=self.timeout)
+            resp = api.responses.create(model=RERANK_MODEL, input=prompt)
+            tin, tout, cost = _usage_cost(resp)
+            stats.update(input_tokens=tin, output_tokens=tout, cost_usd=cost)
+            m = re.search(r"\{.*\}", resp.output_text, re.DOTALL)
+            if not m:
+                return None
+            data = json.loads(m.group(0))
+            ids = [c["id"] for c in candidates[:6]]
+            if data.get("best_id") not in ids:
+                return None
+            return {"rank": ids.index(data["best_id"]), "why": str(data.get("why",""))[:160]}
+        except:
+            return None
@@ -0,0 +1,666 @@
+import heapq
+
+import numpy as np
+
+from .closet_index import ClosetIndex
+from .intent import item_tags, situation_intent
+from .items import ColumnarCloset, known
+from .taste import get_compiled_taste, taste_counts
+from .timing import timed
+from .vocab import NEUTRALS
+
+# =========================
+# Taste score (개인화)
+# =========================
+def taste_score_for_outfit(profile: dict, outfit: dict, now: float = None):
+    """
+    사용자 taste를 기반으로 outfit에 가산/감점
+    - now: 감쇠 기준 시각 (추천에선 compiled 점수표의 as_of → 근거 문구가 점수와 같은 시점)
+    """
+    # decay 켜진 profile 은 now(기본 지금) 시점으로 감쇠한 값
+    taste = taste_counts(profile, now)
+    cp = taste["color_pref"]
+    ca = taste["color_avoid"]
+    pp = taste["pattern_pref"]
+    pa = taste["pattern_avoid"]
+    vp = taste["vibe_pref"]
+    va = taste["vibe_avoid"]
+
+    score = 0
+    reasons = []
+
+    colors = [it.get("color","unknown") for it in outfit.values()]
+    patterns = [it.get("pattern","unknown") for it in outfit.values()]
+    vibes = [it.get("vibe","unknown") for it in outfit.values()]
+
+    # 너무 강하게 하지 말고 "누적값의 log-like"로 완만하게
+    for c in colors:
+        if c != "unknown":
+            if c in cp:
+                add = min(2, int(cp[c] // 3) + 1)  # 1~2
+                score += add
+                reasons.append(f"취향(색) 선호: {c} (+{add})")
+            if c in ca:
+                sub = min(2, int(ca[c] // 3) + 1)
+                score -= sub
+                reasons.append(f"취향(색) 비선호: {c} (-{sub})")
+
+    for p in patterns:
+        if p != "unknown":
+            if p in pp:
+                add = min(2, int(pp[p] // 3) + 1)
+                score += add
+                reasons.append(f"취향(패턴) 선호: {p} (+{add})")
+            if p in pa:
+                sub = min(2, int(pa[p] // 3) + 1)
+                score -= sub
+                reasons.append(f"취향(패턴) 비선호: {p} (-{sub})")
+
+    for v in vibes:
+        if v != "unknown":
+            if v in vp:
+                add = min(2, int(vp[v] // 3) + 1)
+                score += add
+                reasons.append(f"취향(vibe) 선호: {v} (+{add})")
+            if v in va:
+                sub = min(2, int(va[v] // 3) + 1)
+                score -= sub
+                reasons.append(f"취향(vibe) 비선호: {v} (-{sub})")
+
+    return score, reasons[:10]
+
+# =========================
+# Color/pattern/vibe scoring
+# =========================
+def color_compat_score(colors: dict):
+    vals = [c for c in colors.values() if c and c != "unknown"]
+    if not vals:
+        return 0, ["색 정보 부족(unknown)"]
+    reasons = []
+    score = 0
+    neutral_cnt = sum(1 for c in vals if c in NEUTRALS)
+    multi_cnt = sum(1 for c in vals if c == "multi")
+    if neutral_cnt >= 3:
+        score += 2; reasons.append("뉴트럴 중심이라 안정적")
+    elif neutral_cnt >= 2:
+        score += 1; reasons.append("뉴트럴 베이스라 매치 쉬움")
+    if multi_cnt >= 1 and neutral_cnt < 3:
+        score -= 1; reasons.append("멀티가 많으면 복잡할 수 있음")
+    return score, reasons
+
+def pattern_compat_score(patterns: dict):
+    vals = [p for p in patterns.values() if p and p != "unknown"]
+    if not vals:
+        return 0, ["패턴 정보 부족(unknown)"]
+    non_solid = [p for p in vals if p != "solid"]
+    if len(non_solid) == 0:
+        return 1, ["전체 무지라 깔끔"]
+    if len(non_solid) == 1:
+        return 2, ["패턴 1개 포인트"]
+    unique = set(non_solid)
+    if len(unique) >= 2:
+        return -1, ["서로 다른 패턴이 많으면 산만"]
+    return 0, ["같은 계열 패턴 다수(중립)"]
+
+def desired_vibes(situation: str):
+    return situation_intent(situation).desired
+
+def vibe_fit_score(vibes: dict, situation: str):
+    desired = desired_vibes(situation)
+
+    vals = [v for v in vibes.values() if v and v != "unknown"]
+    if not vals or not desired:
+        return 0, ["vibe 정보 부족/상황 목표 없음"]
+    hit = sum(1 for v in vals if v in desired)
+    if hit >= 2:
+        return 2, ["상황과 vibe 다수 일치"]
+    if hit == 1:
+        return 1, ["상황과 vibe 일부 일치"]
+    return -1, ["상황 vibe와 다소 다름"]
+
+# =========================
+# Item score (아이템 단위)
+# =========================
+FORMAL_VIBES = ["formal","minimal","dandy"]
+DATE_VIBES = ["dandy","minimal","cute"]
+
+def item_rules(effective_temp, situation):
+    """
+    아이템 점수 규칙표 [(feature, 점수, 근거)] — item_features 의 bool 컬럼 이름으로
+    - 점수(item_base_scores)와 근거(item_reasons)가 같은 표를 씀 → 규칙은 여기 한 곳에만
+    - 순서 = 근거 문자열 순서 (날씨 → 상황 키워드 → 스타일 태그 → vibe)
+    """
+    rules = []
+    if effective_temp is not None:
+        if effective_temp < 10:
+            rules += [("outer", 4, "추움→아우터 가산"), ("thick", 2, "thick→추운날 가산"), ("thin", -1, "thin→추운날 감점")]
+        if effective_temp >= 22:
+            rules += [("outer", -3, "더움→아우터 감점"), ("thin", 1, "thin→더운날 가산"), ("thick", -1, "thick→더운날 감점")]
+
+    # situation + name keyword (저장 시 만든 이름 태그)
+    intent = situation_intent(situation)
+    if intent.formal:
+        rules += [("formal_name", 3, "격식 키워드 매칭"), ("casual_name", -2, "격식에 캐주얼 감점")]
+    if intent.date:
+        rules.append(("date_name", 2, "데이트/첫만남 깔끔 가산"))
+    if intent.comfy:
+        rules.append(("comfy_name", 2, "편한상황 캐주얼 가산"))
+    if intent.sporty:
+        rules += [("shoes", 2, "운동→신발 중요"), ("sporty_name", 3, "운동 키워드 매칭")]
+
+    # optional style tag (스타일을 안 골랐으면 style 컬럼이 전부 False)
+    rules.append(("style", 1, "선택 스타일 태그 일치"))
+
+    # vibe quick boost
+    if intent.formal:
+        rules.append(("formal_vibe", 1, "격식상황 vibe 일치"))
+    if intent.sporty:
+        rules.append(("sporty_vibe", 1, "운동상황 vibe 일치"))
+    if intent.date:
+        rules.append(("date_vibe", 1, "데이트상황 vibe 일치"))
+    return rules
+
+@timed("recommend.features")
+def item_features(cols: ColumnarCloset, user_style_primary=None):
+    """
+    상황/온도와 무관한 아이템별 특징 (행 순서 bool 배열) — 여러 상황/날짜를 한 번에 추천할 때 1번만 계산
+    - 이름 태그, 카테고리/두께/vibe, 스타일 태그 일치
+    - cols 에 스타일별로 memo (cols 는 옷장이 바뀌기 전까지 rerun/세션이 같이 씀 → 읽기 전용으로)
+    """
+    key = ("features", user_style_primary)
+    hit = cols.memo.get(key)
+    if hit is None:
+        hit = cols.memo[key] = _item_features(cols, user_style_primary)
+    return hit
+
+def _item_features(cols: ColumnarCloset, user_style_primary=None):
+    tags = [item_tags(cols.item(r)) for r in range(len(cols))]
+
+    def tagged(tag):
+        return np.fromiter((tag in t for t in tags), dtype=bool, count=len(tags))
+
+    def coded(field, fn):
+        return cols.vocabs[field].table(fn, dtype=bool)[cols.codes[field]]
+
+    if user_style_primary:
+        style = np.fromiter(
+            ((it.get("primary_style") == user_style_primary or it.get("secondary_style") == user_style_primary)
+             for it in map(cols.item, range(len(cols)))),
+            dtype=bool, count=len(cols))
+    else:
+        style = np.zeros(len(cols), dtype=bool)
+    return {
+        "outer": coded("type", lambda v: v == "outer"),
+        "shoes": coded("type", lambda v: v == "shoes"),
+        "thick": coded("warmth", lambda v: v == "thick"),
+        "thin": coded("warmth", lambda v: v == "thin"),
+        "formal_name": tagged("formal"),
+        "casual_name": tagged("casual"),
+        "date_name": tagged("date"),
+        "comfy_name": tagged("comfy"),
+        "sporty_name": tagged("sporty"),
+        "formal_vibe": coded("vibe", lambda v: v in FORMAL_VIBES),
+        "date_vibe": coded("vibe", lambda v: v in DATE_VIBES),
+        "sporty_vibe": coded("vibe", lambda v: v == "sporty"),
+        "style": style,
+    }
+
+@timed("recommend.base_scores")
+def item_base_scores(features, effective_temp, situation):
+    """item_rules 점수 합을 행 배열로 (근거 문자열 없이, numpy 연산만)"""
+    s = np.zeros(len(features["style"]), dtype=np.int64)
+    for feat, w, _ in item_rules(effective_temp, situation):
+        s += w * features[feat]
+    return s
+
+@timed("recommend.reasons")
+def item_reasons(cols: ColumnarCloset, features, rows, effective_temp, situation):
+    """근거 문자열은 후보에 나온 행만 → {id: [근거]} (해당 규칙이 없으면 "기본 점수")"""
+    rules = item_rules(effective_temp, situation)
+    return {cols.ids[r]: [why for feat, _, why in rules if features[feat][r]] or ["기본 점수"] for r in rows}
+
+# =========================
+# Vectorized outfit scoring
+# =========================
+SLOTS = ["top", "bottom", "shoes", "outer"]
+
+def _taste_table(cols: ColumnarCloset, compiled_taste, attr):
+    """코드 → taste 순점수 (어휘 값은 compiled 배열 그대로, 어휘 밖 값은 extra 조회)"""
+    vocab = cols.vocabs[attr]
+    base = compiled_taste[attr]
+    extra = compiled_taste["extra"][attr]
+    return np.array(
+        [base[c] if c < vocab.base_size else extra.get(v, 0) for c, v in enumerate(vocab.values)],
+        dtype=np.int64,
+    )
+
+@timed("recommend.encode_static")
+def encode_static(cols: ColumnarCloset, compiled_taste):
+    """
+    상황과 무관한 행별 속성 배열 (옷장 전체 길이, 컬럼 gather + 코드 조회표)
+    - 추천 1번(recommend_batch 는 전체에서 1번)만 만들고 슬롯별 encode_rows 가 행만 골라 씀
+    """
+    V = cols.vocabs
+
+    def col(field, table):
+        return table[cols.codes[field]]
+
+    color_known = col("color", V["color"].table(known))
+    non_solid = col("pattern", V["pattern"].table(lambda v: known(v) and v != "solid"))
+    return {
+        "taste": sum(col(a, _taste_table(cols, compiled_taste, a)) for a in ("color", "pattern", "vibe")).astype(np.int64),
+        "color_known": color_known,
+        "neutral": color_known * col("color", V["color"].table(lambda v: v in NEUTRALS)),
+        "multi": color_known * col("color", V["color"].table(lambda v: v == "multi")),
+        "pattern_known": col("pattern", V["pattern"].table(known)),
+        "non_solid": non_solid,
+        # 서로 다른 non-solid 패턴 비교용 코드 (solid/unknown = -1)
+        "pattern": np.where(non_solid == 1, cols.codes["pattern"], -1).astype(np.int64),
+        "vibe_known": col("vibe", V["vibe"].table(known)),
+        "vibe": cols.codes["vibe"],
+    }
+
+@timed("recommend.encode")
+def encode_rows(cols: ColumnarCloset, rows, compiled_taste, situation, base_scores, static=None):
+    """
+    한 슬롯(top/bottom/shoes/outer)의 행들을 정수 속성 배열로 인코딩
+    - rows: cols 의 행 index, -1 은 "아이템 없음"(outer 생략) → 모든 지표 0 (pattern 은 -1)
+    - base_scores: 행별 아이템 점수 배열
+    - static: encode_static 결과 (없으면 여기서 만듦)
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    present = rows >= 0
+    r = np.where(present, rows, 0)
+    if not len(cols):
+        static, base_scores, r = None, None, None
+    elif static is None:
+        static = encode_static(cols, compiled_taste)
+    desired = desired_vibes(situation)
+
+    def take(a, fill=0):
+        if a is None or r is None:
+            return np.full(len(rows), fill, dtype=np.int64)
+        return np.where(present, a[r], fill).astype(np.int64)
+
+    enc = {k: take(None if static is None else static[k], -1 if k == "pattern" else 0)
+           for k in ("taste", "color_known", "neutral", "multi", "pattern_known", "non_solid", "pattern", "vibe_known")}
+    desired_table = cols.vocabs["vibe"].table(lambda v: v in desired)
+    enc["vibe_hit"] = enc["vibe_known"] * take(None if static is None else desired_table[static["vibe"]])
+    enc["base"] = take(base_scores)
+    enc["present"] = present.astype(np.int64)
+    return enc
+
+def _axis(a, k, ndim=4):
+    shape = [1] * ndim
+    shape[k] = a.shape[0]
+    return a.reshape(shape)
+
+@timed("recommend.grid")
+def score_outfit_grid(slots, situation, effective_temp):
+    """
+    모든 top×bottom×shoes×outer 조합 점수를 한 번의 broadcast로 계산
+    - slots: encode_rows 결과 4개 (SLOTS 순서)
+    - return: shape (T, B, S, O) int 배열
+    """
+    def total(key):
+        return sum(_axis(enc[key], k) for k, enc in enumerate(slots))
+
+    # 색 조합
+    neutral = total("neutral")
+    multi = total("multi")
+    c_sc = np.where(neutral >= 3, 2, np.where(neutral >= 2, 1, 0)) - ((multi >= 1) & (neutral < 3))
+    c_sc = np.where(total("color_known") == 0, 0, c_sc)
+
+    # 패턴 조합: 서로 다른 non-solid 패턴 쌍이 하나라도 있으면 "산만"
+    non_solid = total("non_solid")
+    mixed = np.zeros(non_solid.shape, dtype=bool)
+    for a in range(len(slots)):
+        for b in range(a + 1, len(slots)):
+            pa, pb = _axis(slots[a]["pattern"], a), _axis(slots[b]["pattern"], b)
+            mixed = mixed | ((pa >= 0) & (pb >= 0) & (pa != pb))
+    p_sc = np.where(non_solid == 0, 1, np.where(non_solid == 1, 2, np.where(mixed, -1, 0)))
+    p_sc = np.where(total("pattern_known") == 0, 0, p_sc)
+
+    # 상황 vibe
+    if desired_vibes(situation):
+        hit = total("vibe_hit")
+        v_sc = np.where(hit >= 2, 2, np.where(hit == 1, 1, -1))
+        v_sc = np.where(total("vibe_known") == 0, 0, v_sc)
+    else:
+        v_sc = 0
+
+    scores = total("base") + total("taste") + c_sc + p_sc + v_sc
+
+    # 더운 날 outer 감점(-1) + 기본 outer 제외(-1)
+    if effective_temp is not None and effective_temp >= 22:
+        scores = scores - 2 * _axis(slots[3]["present"], 3)
+    return scores
+
+def top_n_indices(scores, n):
+    """
+    점수 내림차순 상위 n개 flat index (동점은 열거 순서 유지 = 기존 stable sort와 동일)
+    """
+    flat = scores.ravel()
+    if flat.size > n:
+        thr = np.partition(flat, flat.size - n)[flat.size - n]
+        sel = np.flatnonzero(flat >= thr)
+    else:
+        sel = np.arange(flat.size)
+    return sel[np.lexsort((sel, -flat[sel]))][:n]
+
+# =========================
+# Exact top-K search (branch-and-bound)
+# =========================
+def _take(enc, idx):
+    return {k: v[idx] for k, v in enc.items()}
+
+EXACT_MAX_CELLS = 2_000_000
+
+@timed("recommend.exact")
+def search_exact(slots, situation, effective_temp, k, seed_width=4, max_cells=None):
+    """
+    옷장 전체 조합에 대한 정확한 top-k (상한으로 가지치기)
+    - 부분 코디 상한 = 고정 아이템 점수 + 남은 슬롯 최고 점수 + 조합 보너스 최대치
+    - 상한이 현재 k번째와 같으면 열거 순서(flat index)가 더 앞설 수 있는 가지만 봄
+    - top/bottom 은 DFS, shoes×outer 는 남은 후보만 broadcast로 한 번에 계산
+    - max_cells: 점수를 계산할 조합 수 상한 (기본 EXACT_MAX_CELLS) — 넘을 것 같으면 None (호출 쪽이 beam 으로)
+    - return: [(score, flat_idx)] 점수 내림차순 (동점은 열거 순서)
+    """
+    shape = tuple(len(enc["base"]) for enc in slots)
+    _, B, S, O = shape
+    if max_cells is None:
+        max_cells = EXACT_MAX_CELLS
+    # 아이템 단위로 분해되는 점수 (base + taste + 더운날 outer 감점)
+    unary = [enc["base"] + enc["taste"] for enc in slots]
+    if effective_temp is not None and effective_temp >= 22:
+        unary[3] = unary[3] - 2 * slots[3]["present"]
+    order = [np.argsort(-u, kind="stable") for u in unary]
+    best = [int(u.max()) for u in unary]
+    # 색(+2) + 패턴(+2) + 상황 vibe(+2, 목표 있을 때만)
+    bonus = 4 + (2 if desired_vibes(situation) else 0)
+
+    heap = []       # (score, -flat_idx) min-heap → heap[0] 이 현재 k번째
+    in_heap = set()
+    cells = 0
+
+    def threshold():
+        """(k번째 점수, 그 flat index) — heap 이 덜 찼으면 None"""
+        return (heap[0][0], -heap[0][1]) if len(heap) >= k else None
+
+    def beats(bound, first_flat, thr):
+        # 상한이 k번째보다 크거나, 같아도 열거 순서가 앞설 수 있으면 들어갈 여지가 있음
+        return bound > thr[0] or (bound == thr[0] and first_flat < thr[1])
+
+    def push(idx):
+        nonlocal cells
+        cells += int(np.prod([len(i) for i in idx]))
+        grid = score_outfit_grid([_take(enc, i) for enc, i in zip(slots, idx)], situation, effective_temp)
+        grid = grid.ravel()
+        flat = np.ravel_multi_index(np.ix_(*idx), shape).ravel()
+        # 같은 점수면 열거 순서가 앞선 쪽이 이기도록 flat 기준으로 정렬
+        for j in np.lexsort((flat, -grid))[:k].tolist():
+            entry = (int(grid[j]), -int(flat[j]))
+            if -entry[1] in in_heap:
+                continue
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                in_heap.discard(-heapq.heapreplace(heap, entry)[1])
+            else:
+                break
+            in_heap.add(-entry[1])
+
+    # 슬롯별 상위 몇 개 조합으로 먼저 heap을 채워 처음부터 가지치기 기준 확보
+    push([o[:seed_width] for o in order])
+
+    for t in order[0]:
+        ut = int(unary[0][t])
+        thr = threshold()
+        bound = ut + best[1] + best[2] + best[3] + bonus
+        if thr is not None and bound < thr[0]:
+            break
+        if thr is not None and not beats(bound, int(t) * B * S * O, thr):
+            continue
+        for b in order[1]:
+            rest = ut + int(unary[1][b]) + bonus
+            thr = threshold()
+            tb = (int(t) * B + int(b)) * S
+            if thr is not None and rest + best[2] + best[3] < thr[0]:
+                break
+            if thr is not None and not beats(rest + best[2] + best[3], tb * O, thr):
+                continue
+            s_idx, o_idx = order[2], order[3]
+            if thr is not None:
+                s_bound = unary[2][s_idx] + rest + best[3]
+                s_idx = s_idx[(s_bound > thr[0]) | ((s_bound == thr[0]) & ((tb + s_idx) * O < thr[1]))]
+                o_bound = unary[3][o_idx] + rest + best[2]
+                o_idx = o_idx[(o_bound > thr[0]) | ((o_bound == thr[0]) & (tb * O + o_idx < thr[1]))]
+            if not len(s_idx) or not len(o_idx):
+                continue
+            if cells + len(s_idx) * len(o_idx) > max_cells:
+                return None
+            push([[t], [b], s_idx, o_idx])
+
+    return [(sc, -neg) for sc, neg in sorted(heap, reverse=True)]
+
+@timed("recommend.candidates")
+def build_candidate(cid, score, outfit, profile, situation, effective_temp, item_reasons, as_of=None):
+    """
+    최종 후보에 대해서만 근거 문자열 생성
+    - as_of: 점수에 쓴 compiled taste 의 시점 (취향 근거도 같은 시점으로)
+    """
+    rs = []
+    for x in outfit.values():
+        rs += item_reasons.get(x["id"], [])
+    if effective_temp is not None and effective_temp >= 22 and "outer" in outfit:
+        rs.append("더운날 아우터 감점")
+
+    _, c_rs = color_compat_score({k: outfit[k].get("color","unknown") for k in outfit.keys()})
+    _, p_rs = pattern_compat_score({k: outfit[k].get("pattern","unknown") for k in outfit.keys()})
+    _, v_rs = vibe_fit_score({k: outfit[k].get("vibe","unknown") for k in outfit.keys()}, situation)
+    _, t_rs = taste_score_for_outfit(profile, outfit, as_of)
+
+    return {
+        "id": cid,
+        "score": score,
+        "outfit": outfit,
+        "reasons": list(dict.fromkeys(rs + c_rs + p_rs + v_rs + t_rs))[:20]
+    }
+
+# =========================
+# Recommendation
+# =========================
+def _rank_outfits(cols, base_scores, compiled_taste, situation, effective_temp,
+                  top_n, per_category, outer_cap, search, exclude=None, static=None, allow_no_outer=False):
+    """
+    행별 아이템 점수 → (상위 코디 [(score, flat_idx, refs)], 실제로 쓴 search) (refs = 슬롯별 closet 행 index)
+    - search="exact" 가 EXACT_MAX_CELLS 를 넘으면 per_category/outer_cap 으로 beam
+    - exclude: {카테고리: 뺄 행 set} — 빼고 나서 비는 카테고리는 그대로 둠
+    - static: encode_static 결과 (recommend_batch 가 미리 만들어 넘김)
+    - allow_no_outer: outer 가 있어도 "outer 없음" 조합을 같이 봄
+    - top/bottom/shoes 중 하나라도 없으면 (None, search)
+    """
+    if static is None:
+        static = encode_static(cols, compiled_taste)
+    ranked = None
+    if search == "exact":
+        slot_rows = _slot_rows(cols, base_scores, None, None, exclude, allow_no_outer)
+        if slot_rows is None:
+            return None, search
+        slots = [encode_rows(cols, rows, compiled_taste, situation, base_scores, static) for rows in slot_rows]
+        ranked = search_exact(slots, situation, effective_temp, top_n)
+    if ranked is None:
+        if search == "exact":
+            search = "beam"
+        slot_rows = _slot_rows(cols, base_scores, per_category, outer_cap, exclude, allow_no_outer)
+        if slot_rows is None:
+            return None, search
+        slots = [encode_rows(cols, rows, compiled_taste, situation, base_scores, static) for rows in slot_rows]
+        scores = score_outfit_grid(slots, situation, effective_temp)
+        ranked = [(int(scores.flat[i]), int(i)) for i in top_n_indices(scores, top_n)]
+
+    shape = tuple(len(rows) for rows in slot_rows)
+    out = []
+    for score, flat_idx in ranked:
+        refs = {k: int(rows[i]) for k, rows, i in zip(SLOTS, slot_rows, np.unravel_index(flat_idx, shape))}
+        if refs["outer"] < 0:
+            del refs["outer"]
+        out.append((score, flat_idx, refs))
+    return out, search
+
+def _slot_rows(cols, base_scores, per_category, outer_cap, exclude=None, allow_no_outer=False):
+    """슬롯별 후보 행 (SLOTS 순서, outer 의 -1 = outer 없음) — top/bottom/shoes 중 하나라도 없으면 None"""
+    def topk(cat, k=None):
+        # 등록 순서의 type 행들을 점수 내림차순 stable 정렬 → 같은 점수는 closet 순서 유지
+        rows = cols.rows_of("type", cat)
+        if exclude and exclude.get(cat):
+            kept = rows[~np.isin(rows, list(exclude[cat]))]
+            rows = kept if len(kept) else rows
+        return rows[np.argsort(-base_scores[rows], kind="stable")][:k]
+
+    tops = topk("top", per_category)
+    bottoms = topk("bottom", per_category)
+    outers = topk("outer", per_category)
+    shoes = topk("shoes", per_category)
+
+    if not len(tops) or not len(bottoms) or not len(shoes):
+        return None
+
+    outer_options = outers[:outer_cap]
+    if allow_no_outer or not len(outers):
+        outer_options = np.append(outer_options, -1)
+    return [tops, bottoms, shoes, outer_options]
+
+def _build_candidates(cols, ranked, profile, situation, effective_temp, item_reasons, as_of=None):
+    top_candidates = []
+    for score, flat_idx, refs in ranked:
+        # outfit dict 는 여기서만 조립 (결과는 저장 스키마 dict — 캐시된 ClosetItem 은 밖으로 안 나감)
+        outfit = {k: cols.item(row).to_dict() for k, row in refs.items()}
+        cand = build_candidate(
+            f"c{flat_idx + 1}", score, outfit,
+            profile, situation, effective_temp, item_reasons, as_of
+        )
+        cand["refs"] = refs
+        top_candidates.append(cand)
+    return top_candidates
+
+def apply_rerank(top_candidates, ai_pick):
+    """리랭크 결과(best_id)가 후보 안에 있으면 그 후보, 아니면 규칙 점수 1순위"""
+    if not top_candidates:
+        return None
+    if ai_pick and ai_pick.get("best_id"):
+        found = next((c for c in top_candidates if c["id"] == ai_pick["best_id"]), None)
+        if found:
+            return found
+    return top_candidates[0]
+
+@timed("recommend")
+def recommend(profile, closet, weather, situation, user_style_primary=None, rerank=None,
+              top_n=6, per_category=4, outer_cap=3, search="beam", allow_no_outer=False):
+    """
+    - closet: item 리스트 또는 ClosetIndex (화면에서 이미 만든 인덱스를 넘기면 다시 만들지 않음)
+    - rerank: (weather, situation, profile, top_candidates) -> {"best_id","why"} | None
+    - search:
+        "beam"  → 카테고리별 상위 per_category(outer는 outer_cap)개만 전체 조합
+        "exact" → 옷장 전체에서 정확한 top_n (branch-and-bound)
+                  조합 수가 EXACT_MAX_CELLS 를 넘으면 beam 으로 (meta["exact_fallback"])
+    - allow_no_outer: outer 가 있어도 outer 없는 코디를 후보에 넣음 (기본은 기존처럼 outer 가 있으면 항상 포함)
+    """
+    if search not in ("beam", "exact"):
+        raise ValueError(f"unknown search mode: {search}")
+
+    temp_bias = float(profile.get("temp_bias", 0.0))
+    temp = weather.get("temperature")
+    effective_temp = None if temp is None else (temp + temp_bias)
+
+    index = closet if isinstance(closet, ClosetIndex) else ClosetIndex(closet)
+    # 점수 계산은 행 index 로만 (dict 는 최종 후보 몇 개를 만들 때만 꺼냄)
+    cols = index.columns()
+    features = item_features(cols, user_style_primary)
+    base_scores = item_base_scores(features, effective_temp, situation)
+
+    compiled_taste = get_compiled_taste(profile)
+    ranked, searched = _rank_outfits(cols, base_scores, compiled_taste, situation, effective_temp,
+                                     top_n, per_category, outer_cap, search, allow_no_outer=allow_no_outer)
+    if ranked is None:
+        return None, [], {"error":"카테고리 부족(top/bottom/shoes 필요)"}, None
+    # 근거 문자열은 후보에 나온 아이템만
+    rows = sorted({r for _, _, refs in ranked for r in refs.values()})
+    reasons = item_reasons(cols, features, rows, effective_temp, situation)
+    top_candidates = _build_candidates(cols, ranked, profile, situation, effective_temp, reasons,
+                                       compiled_taste["as_of"])
+
+    ai_pick = None
+    if rerank and top_candidates:
+        ai_pick = rerank(weather, situation, profile, top_candidates)
+    chosen = apply_rerank(top_candidates, ai_pick)
+
+    meta = {"temp_bias": temp_bias, "effective_temp": effective_temp, "ai_rerank": bool(ai_pick)}
+    if searched != search:
+        meta["exact_fallback"] = True
+    return chosen, top_candidates, meta, ai_pick
+
+# =========================
+# Batch recommendation (여러 날짜/상황)
+# =========================
+NO_REPEAT_SLOTS = ("top", "bottom")
+
+@timed("recommend.batch")
+def recommend_batch(profile, closet, contexts, user_style_primary=None,
+                    top_n=6, per_category=4, outer_cap=3, search="beam", no_repeat=False,
+                    allow_no_outer=False):
+    """
+    여러 (상황, 날씨) 를 한 번에 추천 (주간 코디 계획 등, 리랭크 없음)
+    - contexts: [(situation, weather)] — weather 는 get_weather / get_daily_forecast 의 하루 dict
+    - 아이템 특징(이름 키워드/카테고리/두께/스타일)과 색/패턴/taste 인코딩은 1번만 → 컨텍스트별로는 numpy 연산만
+    - no_repeat: True 면 앞 컨텍스트에서 고른 top/bottom 을 뒤에서 빼고 고름 (슬롯 tuple 로 지정 가능)
+      다 쓴 카테고리는 처음부터 다시 돌리고 그 컨텍스트 meta["repeated"] 에 표시
+    - return: 컨텍스트 순서대로 {"situation", "weather", "chosen", "candidates", "meta"}
+    """
+    if search not in ("beam", "exact"):
+        raise ValueError(f"unknown search mode: {search}")
+    slots_no_repeat = NO_REPEAT_SLOTS if no_repeat is True else tuple(no_repeat or ())
+
+    temp_bias = float(profile.get("temp_bias", 0.0))
+    index = closet if isinstance(closet, ClosetIndex) else ClosetIndex(closet)
+    cols = index.columns()
+    features = item_features(cols, user_style_primary)
+    compiled_taste = get_compiled_taste(profile)
+    static = encode_static(cols, compiled_taste)
+    used = {k: set() for k in slots_no_repeat}
+
+    results = []
+    for situation, weather in contexts:
+        temp = weather.get("temperature")
+        effective_temp = None if temp is None else (temp + temp_bias)
+        base_scores = item_base_scores(features, effective_temp, situation)
+        meta = {"temp_bias": temp_bias, "effective_temp": effective_temp, "ai_rerank": False}
+
+        ranked, searched = _rank_outfits(cols, base_scores, compiled_taste, situation, effective_temp,
+                                         top_n, per_category, outer_cap, search, exclude=used, static=static,
+                                         allow_no_outer=allow_no_outer)
+        if searched != search:
+            meta["exact_fallback"] = True
+        if ranked is None:
+            results.append({"situation": situation, "weather": weather, "chosen": None, "candidates": [],
+                            "meta": dict(meta, error="카테고리 부족(top/bottom/shoes 필요)")})
+            continue
+
+        # 근거 문자열은 후보에 나온 아이템만
+        rows = sorted({r for _, _, refs in ranked for r in refs.values()})
+        reasons = item_reasons(cols, features, rows, effective_temp, situation)
+        candidates = _build_candidates(cols, ranked, profile, situation, effective_temp, reasons,
+                                       compiled_taste["as_of"])
+        chosen = candidates[0]
+
+        repeated = [k for k in slots_no_repeat if chosen["refs"].get(k) in used[k]]
+        if repeated:
+            meta["repeated"] = repeated
+        for k in repeated:
+            used[k] = set()  # 한 바퀴 다 썼으면 처음부터 다시 돌림
+        for k in slots_no_repeat:
+            if k in chosen["refs"]:
+                used[k].add(chosen["refs"][k])
+        results.append({"situation": situation, "weather": weather, "chosen": chosen,
+                        "candidates": candidates, "meta": meta})
+    return results
@@ -0,0 +1,392 @@
+import json, sqlite3, threading
+from datetime import datetime
+from pathlib import Path
+
+from .feedback_log import FeedbackLog
+from .fileio import FileLock, write_atomic
+
+# =========================
+# JSON helpers
+# =========================
+def load_json(path: Path, default):
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return default
+    try:
+        return json.loads(text)
+    except ValueError:
+        # 예전(직접 덮어쓰기) 저장이 남긴 깨진 파일 → 기본값으로 덮어써서 날리지 않게 옆으로 보관
+        try:
+            path.replace(path.with_name(f"{path.name}.corrupt-{datetime.now():%Y%m%d%H%M%S}"))
+        except OSError:
+            pass
+        return default
+
+def save_json(path: Path, obj):
+    write_atomic(path, json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"))
+
+def default_profile():
+    # ✅ 취향 학습 구조 포함
+    return {
+        "temp_bias": 0.0,
+        "taste": {
+            "color_pref": {}, "color_avoid": {},
+            "pattern_pref": {}, "pattern_avoid": {},
+            "vibe_pref": {}, "vibe_avoid": {},
+            "avg_rating": 0.0,
+            "rating_count": 0
+        }
+    }
+
+# =========================
+# JSON backend (기존 방식: 파일 통째로 다시 쓰기)
+# =========================
+class JsonStore:
+    """
+    - 저장은 temp 파일 → rename (읽는 쪽은 잘린 JSON 을 보지 않음)
+    - 같은 사용자 폴더의 .lock 으로 read-modify-write 를 직렬화 (탭/세션/프로세스가 여러 개여도 유실 없음)
+    """
+    def __init__(self, base: Path):
+        self.base = Path(base)
+        self.closet_path = self.base / "closet.json"
+        self.profile_path = self.base / "profile.json"
+        self.lock = FileLock.for_path(self.base / ".lock")
+        self.feedback_log = FeedbackLog(self.base / "feedback.jsonl", lock=self.lock)
+
+        self.base.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            if not self.closet_path.exists():
+                save_json(self.closet_path, [])
+            legacy = self.base / "feedback.json"
+            if legacy.exists() and not self.feedback_log.path.exists():
+                # 예전 feedback.json(배열 통째) → append-only 로그로 1회 변환
+                self.feedback_log.rewrite(load_json(legacy, []))
+                legacy.replace(legacy.with_name("feedback.json.migrated"))
+            if not self.profile_path.exists():
+                save_json(self.profile_path, default_profile())
+
+    def data_version(self, kind):
+        """kind("closet"|"profile"|"feedback") 파일이 바뀌었는지 비교용 값 (mtime_ns, size)"""
+        path = {"closet": self.closet_path, "profile": self.profile_path,
+                "feedback": self.feedback_log.path}[kind]
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # closet
+    def load_closet(self):
+        return load_json(self.closet_path, [])
+
+    def save_closet(self, closet):
+        with self.lock:
+            save_json(self.closet_path, closet)
+
+    def get_item(self, item_id):
+        return next((x for x in self.load_closet() if x.get("id") == item_id), None)
+
+    def items_by_type(self, item_type):
+        return [x for x in self.load_closet() if x.get("type") == item_type]
+
+    def add_item(self, item):
+        self.add_items([item])
+
+    def add_items(self, items):
+        # 같은 id 는 자리 그대로 내용만 교체 (SqliteStore / ClosetIndex 의 upsert 와 같은 결과)
+        with self.lock:
+            closet = self.load_closet()
+            pos = {x.get("id"): i for i, x in enumerate(closet)}
+            for it in items:
+                i = pos.get(it.get("id"))
+                if i is None:
+                    pos[it.get("id")] = len(closet)
+                    closet.append(it)
+                else:
+                    closet[i] = it
+            self.save_closet(closet)
+
+    def delete_item(self, item_id):
+        with self.lock:
+            closet = self.load_closet()
+            self.save_closet([x for x in closet if x.get("id") != item_id])
+
+    # feedback (append-only 로그)
+    def load_feedback(self):
+        return list(self.feedback_log.iter_records())
+
+    def iter_feedback(self):
+        return self.feedback_log.iter_records()
+
+    def tail_feedback(self, n):
+        return self.feedback_log.tail(n)
+
+    def save_feedback(self, logs):
+        self.feedback_log.rewrite(logs)
+
+    def append_feedback(self, record):
+        self.feedback_log.append(record)
+
+    def count_feedback(self):
+        return self.feedback_log.count()
+
+    # profile
+    def load_profile(self):
+        return load_json(self.profile_path, default_profile())
+
+    def save_profile(self, profile):
+        with self.lock:
+            save_json(self.profile_path, profile)
+
+    def update_profile(self, fn):
+        """
+        lock 안에서 최신 profile 을 읽어 fn(profile) → 저장 (다른 세션의 갱신을 덮어쓰지 않게)
+        - fn 이 None 을 반환하면 바뀐 게 없는 것으로 보고 저장 안 함
+        - return: 최신 profile
+        """
+        with self.lock:
+            profile = self.load_profile()
+            new = fn(profile)
+            if new is None:
+                return profile
+            self.save_profile(new)
+            return new
+
+# =========================
+# SQLite backend (행 단위 insert/delete)
+# =========================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    type TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_type ON items(type);
+CREATE TABLE IF NOT EXISTS feedback (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    time TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False)
+
+class SqliteStore:
+    """
+    사용자별 sqlite 파일 하나 (data/users/<id>/ootd.db)
+    - items: id(UNIQUE) / type(index) 조회, 등록 순서는 seq
+    - feedback: append 전용, 한 번 클릭 = 한 행 insert
+    - profile: 단일 행
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Streamlit 세션은 스레드가 달라서 check_same_thread=False + lock
+        self.conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        self.lock = threading.RLock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def data_version(self, kind=None):
+        """다른 연결(프로세스)이 commit 하면 바뀌는 값 (이 연결의 쓰기로는 안 바뀜, kind 와 무관하게 DB 전체)"""
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # closet
+    def load_closet(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM items ORDER BY seq").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def save_closet(self, closet):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM items")
+            self.conn.executemany(
+                "INSERT INTO items (id, type, data) VALUES (?, ?, ?)",
+                [(x["id"], x.get("type"), _dumps(x)) for x in closet]
+            )
+
+    def get_item(self, item_id):
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM items WHERE id = ?", (item_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def items_by_type(self, item_type):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM items WHERE type = ? ORDER BY seq", (item_type,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def add_item(self, item):
+        self.add_items([item])
+
+    def add_items(self, items):
+        # 여러 개도 transaction 한 번
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO items (id, type, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET type = excluded.type, data = excluded.data",
+                [(x["id"], x.get("type"), _dumps(x)) for x in items]
+            )
+
+    def delete_item(self, item_id):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+
+    # feedback
+    def load_feedback(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM feedback ORDER BY seq").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def iter_feedback(self, batch=500):
+        # seq 기준으로 batch 씩 끊어 읽기 (전체를 한 번에 fetch 하지 않음)
+        last = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT seq, data FROM feedback WHERE seq > ? ORDER BY seq LIMIT ?", (last, batch)
+                ).fetchall()
+            if not rows:
+                return
+            for seq, data in rows:
+                yield json.loads(data)
+            last = rows[-1][0]
+
+    def tail_feedback(self, n):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM feedback ORDER BY seq DESC LIMIT ?", (n,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in reversed(rows)]
+
+    def save_feedback(self, logs):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM feedback")
+            self.conn.executemany(
+                "INSERT INTO feedback (time, data) VALUES (?, ?)",
+                [(x.get("time"), _dumps(x)) for x in logs]
+            )
+
+    def append_feedback(self, record):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO feedback (time, data) VALUES (?, ?)",
+                (record.get("time"), _dumps(record))
+            )
+
+    def count_feedback(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+
+    # profile
+    def load_profile(self):
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM profile WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row else default_profile()
+
+    def save_profile(self, profile):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profile (id, data) VALUES (1, ?)", (_dumps(profile),)
+            )
+
+    def update_profile(self, fn):
+        """JsonStore.update_profile 과 같음 — BEGIN IMMEDIATE 로 다른 프로세스의 쓰기와 직렬화"""
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute("SELECT data FROM profile WHERE id = 1").fetchone()
+            profile = json.loads(row[0]) if row else default_profile()
+            new = fn(profile)
+            if new is None:
+                return profile
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profile (id, data) VALUES (1, ?)", (_dumps(new),)
+            )
+            return new
+
+    # meta
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+# =========================
+# JSON → SQLite migration (1회)
+# =========================
+def migrate_json_to_sqlite(base: Path, store: SqliteStore):
+    """
+    data/users/<id>/{closet,feedback,profile}.json (+ feedback.jsonl) → sqlite
+    - meta 'migrated_from_json' 가 있으면 건너뜀 (원본 json 파일은 그대로 둠)
+    - return: 옮긴 (items, feedback) 개수 / 이미 했으면 None
+    """
+    base = Path(base)
+    if store.get_meta("migrated_from_json"):
+        return None
+
+    with store.lock, store.conn:
+        # 두 프로세스가 동시에 처음 열어도 migration 은 1번만 (확인 + 복사를 한 write transaction 으로)
+        store.conn.execute("BEGIN IMMEDIATE")
+        if store.conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+            return None
+        closet = load_json(base / "closet.json", [])
+        logs = load_json(base / "feedback.json", []) + list(FeedbackLog(base / "feedback.jsonl").iter_records())
+        profile = load_json(base / "profile.json", None)
+
+        store.conn.executemany(
+            "INSERT INTO items (id, type, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET type = excluded.type, data = excluded.data",
+            [(x["id"], x.get("type"), _dumps(x)) for x in closet if x.get("id")]
+        )
+        store.conn.executemany(
+            "INSERT INTO feedback (time, data) VALUES (?, ?)",
+            [(x.get("time"), _dumps(x)) for x in logs]
+        )
+        if profile is not None:
+            store.conn.execute(
+                "INSERT OR REPLACE INTO profile (id, data) VALUES (1, ?)", (_dumps(profile),)
+            )
+        store.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+            (datetime.now().isoformat(),)
+        )
+    return len(closet), len(logs)
+
+def open_store(base: Path, backend: str = "sqlite"):
+    """
+    - backend: "sqlite"(기본) | "json"
+    - sqlite 는 처음 열 때 기존 json 파일을 자동으로 1회 migration
+    """
+    base = Path(base)
+    if backend == "json":
+        return JsonStore(base)
+    if backend != "sqlite":
+        raise ValueError(f"unknown storage backend: {backend}")
+    store = SqliteStore(base / "ootd.db")
+    migrate_json_to_sqlite(base, store)
+    return store
+
+if __name__ == "__main__":
+    # python -m ootd.storage data/users/<id> [...]
+    import sys
+    for arg in sys.argv[1:]:
+        s = SqliteStore(Path(arg) / "ootd.db")
+        print(arg, migrate_json_to_sqlite(Path(arg), s) or "already migrated")
+        s.close()
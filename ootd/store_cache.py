@@ -0,0 +1,221 @@
+import copy, itertools, json, os, threading, time
+from collections import OrderedDict
+from pathlib import Path
+
+from .closet_index import ClosetIndex
+from .storage import open_store
+
+# =========================
+# Process-wide store cache (모든 세션/rerun 공유)
+# =========================
+# 사용자 전체 합쳐서 이 크기(대략, JSON 직렬화 길이 기준)를 넘으면 오래 안 쓴 사용자 것부터 제거
+CACHE_BYTES = int(float(os.environ.get("OOTD_STORE_CACHE_MB", "64")) * 1024 * 1024)
+# 다른 프로세스가 바꿨는지(data_version) 확인하는 최소 간격(초) — 그 사이 rerun 은 디스크를 전혀 안 봄
+RECHECK_SEC = float(os.environ.get("OOTD_STORE_RECHECK", "2"))
+# closet 크기 추정용 표본 아이템 수 (전체를 직렬화하지 않음)
+SIZE_SAMPLE = 32
+
+_MISSING = object()
+
+def _approx_bytes(obj):
+    try:
+        return len(json.dumps(obj, ensure_ascii=False, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+class SizedLRU:
+    """byte 합계로 제한하는 LRU (key → (value, nbytes))"""
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.data = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            hit = self.data.get(key, _MISSING)
+            if hit is _MISSING:
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return hit[0]
+
+    def set(self, key, value, nbytes):
+        with self.lock:
+            old = self.data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self.data[key] = (value, nbytes)
+            self.bytes += nbytes
+            # 방금 넣은 것 하나는 남김 (한도보다 큰 옷장도 캐시는 됨)
+            while self.bytes > self.max_bytes and len(self.data) > 1:
+                _, (_, n) = self.data.popitem(last=False)
+                self.bytes -= n
+
+    def drop(self, match):
+        """match(key) 가 True 인 항목 제거"""
+        with self.lock:
+            for k in [k for k in self.data if match(k)]:
+                self.bytes -= self.data.pop(k)[1]
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.data), "bytes": self.bytes}
+
+_data = SizedLRU()
+
+class CachedStore:
+    """
+    open_store 결과를 감싸서 읽기는 프로세스 캐시(_data)에서, 쓰기는 그대로 저장소에 + 캐시 갱신
+    - closet: ClosetIndex(ClosetItem 레코드)로 보관 (load_closet 은 그 순서대로 새 dict list) → 추천 컬럼 캐시까지 rerun 사이에 재사용
+      추가/삭제는 공유 인덱스를 고치지 않고 copy() 한 새 판으로 교체 (다른 세션이 쓰는 중이어도 안전)
+    - profile: 꺼낼 때 deepcopy (호출하는 쪽이 고쳐도 캐시는 그대로)
+    - feedback: 개수 / 최근 n개
+    - 다른 프로세스의 변경은 RECHECK_SEC 마다 store.data_version(kind) 로 확인
+    - 그 밖의 메서드(get_item, iter_feedback ...)는 원래 store 로 그대로
+    """
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        self.lock = threading.RLock()
+        self._checked = {}
+        self._versions = {}
+        self._item_bytes = 1024  # 아이템 1개 평균 크기 추정 (처음 로드할 때 표본으로)
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def _drop(self, kind):
+        _data.drop(lambda k: k[0] == self.key and k[1] == kind)
+
+    def _revalidate(self, kind):
+        now = time.monotonic()
+        if now - self._checked.get(kind, float("-inf")) < RECHECK_SEC:
+            return
+        self._checked[kind] = now
+        v = self.store.data_version(kind)
+        if v != self._versions.get(kind, _MISSING):
+            self._versions[kind] = v
+            self._drop(kind)
+
+    def _get(self, kind, sub, load, size=_approx_bytes):
+        with self.lock:
+            self._revalidate(kind)
+            key = (self.key, kind, sub)
+            v = _data.get(key, _MISSING)
+            if v is _MISSING:
+                v = load()
+                _data.set(key, v, size(v))
+            return v
+
+    # closet
+    def closet_index(self):
+        """공유 ClosetIndex (읽기 전용으로 쓰기 — 바꿀 땐 add_items/delete_item 으로)"""
+        return self._get("closet", "index", lambda: ClosetIndex(self.store.load_closet()), size=self._index_bytes)
+
+    def _index_bytes(self, idx, resample=True):
+        """아이템 수 × 평균 크기 × 2 (인덱스/컬럼 몫) — 평균은 앞쪽 SIZE_SAMPLE 개만 직렬화해서"""
+        if resample and len(idx):
+            sample = [it.to_dict() for it in itertools.islice(idx.items.values(), SIZE_SAMPLE)]
+            self._item_bytes = _approx_bytes(sample) // len(sample)
+        return 2 * len(idx) * self._item_bytes
+
+    def load_closet(self):
+        return [it.to_dict() for it in self.closet_index()]
+
+    def _update_index(self, change):
+        """저장 후 호출: 캐시에 인덱스가 있으면 복사본에 change 적용해서 교체, 없으면 다음 읽기 때 로드"""
+        with self.lock:
+            key = (self.key, "closet", "index")
+            idx = _data.get(key, None)
+            self._drop("closet")
+            if idx is not None:
+                idx = idx.copy()
+                change(idx)
+                # 크기는 바뀐 아이템 수만큼만 반영 (옷장 전체 직렬화 X → 쓰기 1번이 O(옷장) 이 되지 않게)
+                _data.set(key, idx, self._index_bytes(idx, resample=False))
+
+    def save_closet(self, closet):
+        self.store.save_closet(closet)
+        self._drop("closet")
+
+    def add_item(self, item):
+        self.add_items([item])
+
+    def add_items(self, items):
+        self.store.add_items(items)
+        self._update_index(lambda idx: idx.add_many(items))
+
+    def delete_item(self, item_id):
+        self.store.delete_item(item_id)
+        self._update_index(lambda idx: idx.remove(item_id))
+
+    # profile
+    def load_profile(self):
+        return copy.deepcopy(self._get("profile", None, self.store.load_profile))
+
+    def _set_profile(self, profile):
+        with self.lock:
+            _data.set((self.key, "profile", None), copy.deepcopy(profile), _approx_bytes(profile))
+
+    def save_profile(self, profile):
+        self.store.save_profile(profile)
+        self._set_profile(profile)
+
+    def update_profile(self, fn):
+        with self.lock:
+            profile = self.store.update_profile(fn)
+            self._set_profile(profile)
+            return profile
+
+    # feedback
+    def count_feedback(self):
+        return self._get("feedback", "count", self.store.count_feedback)
+
+    def tail_feedback(self, n):
+        return list(self._get("feedback", ("tail", n), lambda: self.store.tail_feedback(n)))
+
+    def append_feedback(self, record):
+        self.store.append_feedback(record)
+        self._drop("feedback")
+
+    def save_feedback(self, logs):
+        self.store.save_feedback(logs)
+        self._drop("feedback")
+
+# 열어 둔 store 개수 한도 (넘으면 오래 안 쓴 사용자 것부터 놓음 → 참조가 없어지면 sqlite 연결도 닫힘)
+MAX_STORES = int(os.environ.get("OOTD_STORE_MAX_OPEN", "256"))
+_stores = OrderedDict()
+_stores_lock = threading.Lock()
+
+def open_cached_store(base: Path, backend: str = "sqlite"):
+    """
+    사용자 폴더 + backend 당 CachedStore 1개 (프로세스 전체 공유)
+    - 처음 한 번만 open_store (sqlite 연결/스키마/migration 확인) → 이후 rerun 은 dict 조회만
+    """
+    key = (os.path.abspath(str(base)), backend)
+    with _stores_lock:
+        s = _stores.get(key)
+        if s is None:
+            s = _stores[key] = CachedStore(open_store(Path(base), backend=backend), key)
+            while len(_stores) > MAX_STORES:
+                _stores.popitem(last=False)
+        else:
+            _stores.move_to_end(key)
+        return s
+
+def invalidate(base: Path = None, backend: str = None):
+    """캐시 비우기 (base 없으면 전부) — 밖에서 파일을 직접 고쳤을 때"""
+    prefix = None if base is None else os.path.abspath(str(base))
+    _data.drop(lambda k: prefix is None or (k[0][0] == prefix and backend in (None, k[0][1])))
+    with _stores_lock:
+        for key, s in _stores.items():
+            if prefix is None or (key[0] == prefix and backend in (None, key[1])):
+                s._versions.clear()
+                s._checked.clear()
+
+def cache_stats():
+    return _data.stats()
@@ -0,0 +1,270 @@
+import time
+from datetime import datetime
+
+from .timing import timed
+from .vocab import COLORS, PATTERNS, VIBES
+
+# =========================
+# Taste learning helpers (AI 중심)
+# =========================
+def clamp(x, lo, hi):
+    return max(lo, min(hi, x))
+
+def inc(d: dict, key: str, delta: int = 1):
+    if not key: return
+    d[key] = int(d.get(key, 0)) + delta
+
+ATTRS = {"color": COLORS, "pattern": PATTERNS, "vibe": VIBES}
+BUCKETS = [f"{a}_{k}" for a in ATTRS for k in ("pref", "avoid")]
+_VOCAB_ID = {a: {v: i for i, v in enumerate(vocab)} for a, vocab in ATTRS.items()}
+
+# =========================
+# Time decay (최근 피드백일수록 크게)
+# =========================
+# taste["decay"] = {"half_life_days", "t0", "weights": {bucket: {값: w}}}
+# - 가중치는 t0 기준으로 스케일해서 저장: 시각 t 이벤트는 2^((t - t0) / H) 를 더함
+# - 시각 now 의 실제 값 = w × 2^(-(now - t0) / H) → 피드백 1번에 해당 키만 O(1) 갱신
+# - 지수가 너무 커지면 t0 를 당겨서 한 번 정규화 (키 개수 = 어휘 크기라 작음)
+DEFAULT_HALF_LIFE_DAYS = 60.0
+MIN_WEIGHT = 0.5  # 이보다 작게 남은 취향은 "없음" 취급
+_RENORM_EXP = 40
+
+def _scale(decay: dict, t: float):
+    return 2.0 ** ((t - decay["t0"]) / (decay["half_life_days"] * 86400.0))
+
+def init_decay(taste: dict, now: float, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+    """예전 profile: 지금까지의 누적 카운트를 "지금" 시점 가중치로 시작"""
+    taste["decay"] = {
+        "half_life_days": half_life_days,
+        "t0": now,
+        "weights": {b: {k: float(v) for k, v in taste.get(b, {}).items()} for b in BUCKETS},
+    }
+    return taste["decay"]
+
+def _decay_on(taste: dict):
+    d = taste.get("decay")
+    return d if d and d.get("half_life_days") else None
+
+def _add_decayed(decay: dict, bucket: str, key: str, t: float):
+    if (t - decay["t0"]) / (decay["half_life_days"] * 86400.0) > _RENORM_EXP:
+        f = 1.0 / _scale(decay, t)
+        for ws in decay["weights"].values():
+            for k in ws:
+                ws[k] *= f
+        decay["t0"] = t
+    ws = decay["weights"].setdefault(bucket, {})
+    ws[key] = ws.get(key, 0.0) + _scale(decay, t)
+
+def taste_counts(profile: dict, now: float = None):
+    """
+    점수 계산에 쓸 bucket별 카운트
+    - decay 꺼져 있으면 누적 카운트 그대로, 켜져 있으면 now 시점으로 감쇠한 값 (MIN_WEIGHT 미만 제외)
+    """
+    taste = profile.get("taste", {})
+    d = _decay_on(taste)
+    if not d:
+        return {b: taste.get(b, {}) for b in BUCKETS}
+    s = _scale(d, time.time() if now is None else now)
+    out = {}
+    for b in BUCKETS:
+        out[b] = {k: w / s for k, w in d["weights"].get(b, {}).items() if w / s >= MIN_WEIGHT}
+    return out
+
+# =========================
+# Compiled taste (추천용 per-attribute 점수표)
+# =========================
+# 포맷이 바뀌면 올리기 → 예전 compiled 는 자동으로 다시 계산
+TASTE_VERSION = 2
+# decay 켜져 있으면 시간이 지나면서 점수가 바뀌므로 이 간격마다 다시 계산
+COMPILE_TTL = 6 * 3600
+
+def _bonus(w: float):
+    # taste_score_for_outfit 와 같은 규칙: 1~2회 +1, 3회 이상 +2 (최대 2)
+    if w < MIN_WEIGHT:
+        return 0
+    return min(2, int(w // 3) + 1)
+
+def _weight(taste: dict, bucket: str, key: str, as_of: float):
+    d = _decay_on(taste)
+    if not d:
+        return float(taste.get(bucket, {}).get(key, 0))
+    return d["weights"].get(bucket, {}).get(key, 0.0) / _scale(d, as_of)
+
+def _net(taste: dict, attr: str, key: str, as_of: float):
+    if key == "unknown":
+        return 0
+    return _bonus(_weight(taste, f"{attr}_pref", key, as_of)) - _bonus(_weight(taste, f"{attr}_avoid", key, as_of))
+
+def _set_entry(compiled: dict, taste: dict, attr: str, key: str):
+    """한 속성값만 다시 계산 (피드백 1번 = 최대 아이템 수만큼 O(1))"""
+    net = _net(taste, attr, key, compiled["as_of"])
+    i = _VOCAB_ID[attr].get(key)
+    if i is not None:
+        compiled[attr][i] = net
+    elif net:
+        compiled["extra"][attr][key] = net
+    else:
+        compiled["extra"][attr].pop(key, None)
+
+def compile_taste(profile: dict, now: float = None):
+    """
+    taste 카운트(또는 감쇠 가중치) → 어휘 index 별 순점수(선호 가산 - 비선호 감점) dense 배열
+    - {"version", "rating_count", "half_life_days", "as_of", "color": [..], "pattern": [..], "vibe": [..], "extra": {어휘 밖 값}}
+    """
+    taste = profile.get("taste", {})
+    d = _decay_on(taste)
+    compiled = {
+        "version": TASTE_VERSION,
+        "rating_count": int(taste.get("rating_count", 0)),
+        "half_life_days": d["half_life_days"] if d else None,
+        "as_of": time.time() if now is None else now,
+        "extra": {a: {} for a in ATTRS},
+    }
+    for attr, vocab in ATTRS.items():
+        compiled[attr] = [_net(taste, attr, v, compiled["as_of"]) for v in vocab]
+        if d:
+            keys = set(d["weights"].get(f"{attr}_pref", {})) | set(d["weights"].get(f"{attr}_avoid", {}))
+        else:
+            keys = set(taste.get(f"{attr}_pref", {})) | set(taste.get(f"{attr}_avoid", {}))
+        for k in keys - set(vocab):
+            _set_entry(compiled, taste, attr, k)
+    return compiled
+
+def _is_fresh(profile: dict, now: float = None):
+    c = profile.get("taste_compiled")
+    taste = profile.get("taste", {})
+    d = _decay_on(taste)
+    if not c or c.get("version") != TASTE_VERSION:
+        return False
+    if c.get("rating_count") != int(taste.get("rating_count", 0)):
+        return False
+    if c.get("half_life_days") != (d["half_life_days"] if d else None):
+        return False
+    if d and (time.time() if now is None else now) - c.get("as_of", 0) > COMPILE_TTL:
+        return False
+    return True
+
+def ensure_compiled_taste(profile: dict, now: float = None):
+    """compiled 가 없거나(예전 profile) 버전/카운트/시점이 안 맞으면 다시 계산. return: 다시 계산했는지"""
+    if _is_fresh(profile, now):
+        return False
+    profile["taste_compiled"] = compile_taste(profile, now)
+    return True
+
+def get_compiled_taste(profile: dict, now: float = None):
+    if _is_fresh(profile, now):
+        return profile["taste_compiled"]
+    return compile_taste(profile, now)
+
+# =========================
+# Feedback → taste update
+# =========================
+@timed("taste.update")
+def update_taste_from_feedback(profile: dict, outfit: dict, rating: int, fb_temp: str,
+                               color_fb: str, pattern_fb: str, vibe_fb: str, now: float = None):
+    """
+    - rating: 1~5
+    - fb_temp: 추움/딱 좋음/더움
+    - color_fb/pattern_fb/vibe_fb: 좋음/별로/상관없음
+    - now: 피드백 시각(epoch 초, 기본 지금) — replay 할 때 기록 시각을 넣음
+    - 누적 카운트(대시보드용) + 감쇠 가중치 + taste_compiled 를 바뀐 값만 같이 갱신
+    """
+    now = time.time() if now is None else now
+    taste = profile.setdefault("taste", {
+        "color_pref": {}, "color_avoid": {},
+        "pattern_pref": {}, "pattern_avoid": {},
+        "vibe_pref": {}, "vibe_avoid": {},
+        "avg_rating": 0.0, "rating_count": 0
+    })
+    decay = taste.get("decay") or init_decay(taste, now)
+    ensure_compiled_taste(profile, now)
+    compiled = profile["taste_compiled"]
+
+    # 1) 별점 평균 업데이트
+    cnt = int(taste.get("rating_count", 0))
+    avg = float(taste.get("avg_rating", 0.0))
+    new_avg = (avg * cnt + rating) / (cnt + 1)
+    taste["avg_rating"] = round(new_avg, 3)
+    taste["rating_count"] = cnt + 1
+    compiled["rating_count"] = cnt + 1
+
+    # 2) 온도 보정 학습(기존 유지)
+    bias = float(profile.get("temp_bias", 0.0))
+    if fb_temp == "추움":
+        bias += 1.0
+    elif fb_temp == "더움":
+        bias -= 1.0
+    profile["temp_bias"] = clamp(bias, -5.0, 5.0)
+
+    # 3) 색/패턴/분위기 학습: 코디에 등장한 값들에 대해 누적
+    for attr, fb in (("color", color_fb), ("pattern", pattern_fb), ("vibe", vibe_fb)):
+        if fb == "좋음":
+            bucket = f"{attr}_pref"
+        elif fb == "별로":
+            bucket = f"{attr}_avoid"
+        else:
+            continue
+        for it in outfit.values():
+            v = it.get(attr, "unknown")
+            if v != "unknown":
+                inc(taste.setdefault(bucket, {}), v)
+                if decay.get("half_life_days"):
+                    _add_decayed(decay, bucket, v, now)
+                _set_entry(compiled, taste, attr, v)
+
+    return profile
+
+# =========================
+# Replay: 피드백 로그 → profile 재구성 (1회 스트리밍)
+# =========================
+def _record_time(rec: dict, default: float):
+    try:
+        return datetime.fromisoformat(str(rec.get("time"))).timestamp()
+    except ValueError:
+        return default
+
+def replay_profile(feedback_iter, items_by_id: dict, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+    """
+    - feedback_iter: 오래된 순 피드백 기록 (store.iter_feedback())
+    - items_by_id: 현재 옷장 id → item (삭제된 아이템은 색/패턴/분위기 없이 별점/온도만 반영)
+    - half_life_days: 0 이면 감쇠 없음 (예전 방식 누적)
+    - 기록마다 update_taste_from_feedback 한 번 → 전체 O(n)
+    """
+    from .storage import default_profile
+    profile = default_profile()
+    last = 0.0
+    for rec in feedback_iter:
+        t = _record_time(rec, last)
+        last = max(last, t)
+        if "decay" not in profile["taste"]:
+            init_decay(profile["taste"], t, half_life_days)
+        outfit = {k: items_by_id[i] for k, i in (rec.get("outfit") or {}).items() if i in items_by_id}
+        sf = rec.get("style_feedback") or {}
+        update_taste_from_feedback(
+            profile, outfit, int(rec.get("rating", 3)), rec.get("temp_feedback", ""),
+            sf.get("color", ""), sf.get("pattern", ""), sf.get("vibe", ""), now=t
+        )
+    if "decay" not in profile["taste"]:
+        init_decay(profile["taste"], time.time(), half_life_days)
+    ensure_compiled_taste(profile)
+    return profile
+
+if __name__ == "__main__":
+    # python -m ootd.taste data/users/<id> [--half-life 30] [--backend json] [--dry-run]
+    import argparse, os
+    from .storage import open_store
+
+    ap = argparse.ArgumentParser(description="피드백 로그로 취향 profile 다시 만들기")
+    ap.add_argument("user_dir")
+    ap.add_argument("--half-life", type=float, default=DEFAULT_HALF_LIFE_DAYS, help="반감기(일), 0=감쇠 없음")
+    ap.add_argument("--backend", default=os.environ.get("OOTD_STORAGE", "sqlite"))
+    ap.add_argument("--dry-run", action="store_true")
+    a = ap.parse_args()
+
+    store = open_store(a.user_dir, backend=a.backend)
+    items = {it.get("id"): it for it in store.load_closet()}
+    new_profile = replay_profile(store.iter_feedback(), items, a.half_life)
+    taste = new_profile["taste"]
+    print(f"replayed {taste['rating_count']} feedback, avg {taste['avg_rating']}, temp_bias {new_profile['temp_bias']:+.1f}")
+    if not a.dry_run:
+        store.save_profile(new_profile)
@@ -0,0 +1,101 @@
+import contextvars, json, os, threading, time
+from contextlib import nullcontext
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+# =========================
+# Per-rerun stage timings (stage() / @timed)
+# =========================
+# 켜져 있을 때만 기록 → 꺼져 있으면 contextvar 조회 1번이라 그냥 둬도 됨
+# 백그라운드 스레드(리랭크/위치 pool)는 기록 안 됨 → 메인 스크립트에서 기다린 시간으로 잡음
+TRACE_DIR = os.environ.get("OOTD_TRACE_DIR", str(Path("data") / "traces"))
+
+_current = contextvars.ContextVar("ootd_timings", default=None)
+_write_lock = threading.Lock()
+
+class Timings:
+    """rerun 1번 동안의 stage 별 (횟수, 누적 시간)"""
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.stages = {}  # name -> [count, seconds] (처음 기록된 순서)
+
+    def add(self, name: str, seconds: float):
+        s = self.stages.get(name)
+        if s is None:
+            self.stages[name] = [1, seconds]
+        else:
+            s[0] += 1
+            s[1] += seconds
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self):
+        return [{"stage": k, "ms": round(v[1] * 1000, 2), "count": v[0]} for k, v in self.stages.items()]
+
+    def to_record(self, **ctx):
+        return {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "label": self.label,
+            "total_ms": round(self.total_ms(), 2),
+            **ctx,
+            "stages": self.summary(),
+        }
+
+    def write_jsonl(self, path=None, **ctx):
+        """trace 파일에 1줄 추가 (기본: TRACE_DIR/<날짜>.jsonl)"""
+        path = Path(path) if path else Path(TRACE_DIR) / f"{datetime.now():%Y-%m-%d}.jsonl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(self.to_record(**ctx), ensure_ascii=False) + "\n"
+        with _write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return path
+
+def start(label: str = ""):
+    """이번 실행(현재 스레드/context)에서 기록 시작 → Timings 반환"""
+    t = Timings(label)
+    _current.set(t)
+    return t
+
+def stop():
+    _current.set(None)
+
+class _Stage:
+    __slots__ = ("t", "name", "s")
+
+    def __init__(self, t, name):
+        self.t = t
+        self.name = name
+
+    def __enter__(self):
+        self.s = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.t.add(self.name, time.perf_counter() - self.s)
+
+_OFF = nullcontext()
+
+def stage(name: str):
+    """with stage("weather"): ... — 기록 중이 아니면 공유 no-op context 반환"""
+    t = _current.get()
+    return _OFF if t is None else _Stage(t, name)
+
+def timed(name: str = None):
+    """함수 전체를 stage 로 (@timed("recommend.base_scores"))"""
+    def deco(fn):
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            t = _current.get()
+            if t is None:
+                return fn(*args, **kwargs)
+            s = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                t.add(label, time.perf_counter() - s)
+        return wrapper
+    return deco
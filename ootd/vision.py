@@ -0,0 +1,129 @@
+import base64, hashlib, json, re, time
+
+from .cache import TTLCache, disk_dir
+from .timing import timed
+from .vocab import COLORS, PATTERNS, WARMTH, VIBES
+
+# =========================
+# OpenAI Vision: photo -> meta
+# =========================
+VISION_MODEL = "gpt-4.1-mini"
+
+PROMPT_TEMPLATE = """
+너는 의류 사진 분석기야. 아래 선택지 중에서만 골라 JSON만 반환해.
+- color: {colors}
+- pattern: {patterns}
+- warmth: {warmth}
+- vibe: {vibes}
+
+규칙:
+- 확실치 않으면 unknown
+- desc는 한국어 1문장(짧게)
+JSON만 반환.
+
+힌트: {hint}
+반환:
+{{"color":"black","pattern":"solid","warmth":"normal","vibe":"dandy","desc":"..."}}
+"""
+
+# 프롬프트/모델/어휘가 바뀌면 버전이 바뀌어서 예전 캐시는 자동으로 안 쓰임
+PROMPT_VERSION = hashlib.sha1(
+    (VISION_MODEL + PROMPT_TEMPLATE + repr((COLORS, PATTERNS, WARMTH, VIBES))).encode("utf-8")
+).hexdigest()[:12]
+
+def unknown_meta():
+    return {"color":"unknown","pattern":"unknown","warmth":"unknown","vibe":"unknown","desc":""}
+
+# 재시도할 만한 실패: 연결/타임아웃, 429, 5xx (openai 는 import 하지 않고 예외 모양으로 판단)
+_TRANSIENT_ERRORS = ("APIConnectionError", "APITimeoutError")
+
+def _is_transient(e: Exception):
+    status = getattr(e, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    if isinstance(e, (ConnectionError, TimeoutError)):
+        return True
+    return any(c.__name__ in _TRANSIENT_ERRORS for c in type(e).__mro__)
+
+def _request_analysis(client, image_bytes: bytes, fallback_name: str = ""):
+    """
+    실패하면 None (캐시에 남기지 않기 위해 unknown 과 구분)
+    - 네트워크/타임아웃/429/5xx 는 예외 그대로 올림 → 호출하는 쪽이 재시도
+    - 응답은 왔는데 JSON 이 아니거나 4xx 등은 바로 None (다시 불러도 같음)
+    """
+    b64 = base64.b64encode(image_bytes).decode("utf-8")
+    prompt = PROMPT_TEMPLATE.format(
+        colors=COLORS, patterns=PATTERNS, warmth=WARMTH, vibes=VIBES, hint=fallback_name
+    ).strip()
+    try:
+        resp = client.responses.create(
+            model=VISION_MODEL,
+            input=[{
+                "role":"user",
+                "content":[
+                    {"type":"input_text","text":prompt},
+                    {"type":"input_image","image_url":f"data:image/png;base64,{b64}"}
+                ]
+            }]
+        )
+    except Exception as e:
+        if _is_transient(e):
+            raise
+        return None
+    try:
+        m = re.search(r"\{.*\}", resp.output_text, re.DOTALL)
+        if not m:
+            return None
+        data = json.loads(m.group(0))
+
+        c = data.get("color","unknown")
+        p = data.get("pattern","unknown")
+        w = data.get("warmth","unknown")
+        v = data.get("vibe","unknown")
+        d = str(data.get("desc",""))[:120]
+
+        if c not in COLORS: c = "unknown"
+        if p not in PATTERNS: p = "unknown"
+        if w not in WARMTH: w = "unknown"
+        if v not in VIBES: v = "unknown"
+        return {"color":c, "pattern":p, "warmth":w, "vibe":v, "desc":d}
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+# =========================
+# Content-hash cache (모든 사용자 공유)
+# =========================
+vision_cache = TTLCache(maxsize=512, ttl=None, disk_dir=disk_dir("vision"), disk_maxsize=5000)
+
+def vision_cache_key(image_bytes: bytes):
+    # 힌트(이름)는 키에 넣지 않음: 결과는 사진 내용이 결정하고, 같은 사진은 이름이 달라도 재사용
+    return f"{PROMPT_VERSION}:{hashlib.sha256(image_bytes).hexdigest()}"
+
+@timed("vision")
+def analyze_clothing_image_with_openai(client, image_bytes: bytes, fallback_name: str = "",
+                                       limiter=None, retries=2, backoff=0.5):
+    """
+    같은 사진(바이트 해시) + 같은 프롬프트 버전이면 캐시에서 바로 반환
+    - 미리보기 → 저장, 같은 사진 재업로드 시 Vision 호출 1번만
+    - limiter: 실제 API 호출 직전에 limiter.wait() (캐시 hit 은 제한에 안 걸림)
+    - retries: 네트워크/타임아웃/429/5xx 일 때만 backoff × 2^n 초 쉬고 재시도 (파싱 실패는 바로 unknown)
+    """
+    if not client:
+        return unknown_meta()
+
+    def call():
+        for attempt in range(retries + 1):
+            if limiter:
+                limiter.wait()
+            try:
+                return _request_analysis(client, image_bytes, fallback_name)
+            except Exception:
+                if attempt == retries:
+                    return None
+            time.sleep(backoff * (2 ** attempt))
+
+    meta = vision_cache.get_or_set(vision_cache_key(image_bytes), call, cache_if=lambda v: v is not None)
+    return dict(meta) if meta else unknown_meta()
+
+def vision_cache_stats():
+    return vision_cache.stats()
@@ -0,0 +1,44 @@
+# =========================
+# Vocab
+# =========================
+CATEGORIES = ["top", "bottom", "outer", "shoes"]
+STYLES = ["casual", "dandy", "hiphop", "sporty"]
+
+COLORS = ["black","white","gray","navy","beige","brown","blue","green","red","pink","purple","yellow","orange","multi","unknown"]
+PATTERNS = ["solid","stripe","check","denim","logo","graphic","dot","floral","leather","knit","unknown"]
+WARMTH = ["thin","normal","thick","unknown"]
+VIBES = ["casual","dandy","hiphop","sporty","minimal","street","formal","cute","unknown"]
+
+NEUTRALS = {"black","white","gray","navy","beige","brown"}
+
+SITUATIONS = [
+    "학교/수업(무난 & 편함)",
+    "데이트(호감/깔끔)",
+    "친구 약속(꾸안꾸)",
+    "소개팅/첫만남(호감/단정)",
+    "면접/발표/중요한 날(힘줘야 함)",
+    "동아리/모임/회식(적당히 갖춘)",
+    "출근/미팅(단정/실용)",
+    "여행/나들이(활동/사진)",
+    "운동/러닝(스포티)",
+    "집콕/근처 마실(편안)",
+    "결혼식/격식(포멀)",
+    "장례식/예의(차분)",
+]
+
+def situation_hint(s):
+    mapping = {
+        "학교/수업(무난 & 편함)": "편안하지만 깔끔. 너무 과한 포인트는 X",
+        "데이트(호감/깔끔)": "깔끔+포인트 1개. 실루엣 정돈",
+        "친구 약속(꾸안꾸)": "편안하지만 센스 있게. 베이직 + 포인트",
+        "소개팅/첫만남(호감/단정)": "단정·깔끔·과하지 않게",
+        "면접/발표/중요한 날(힘줘야 함)": "정돈된 느낌/신뢰감. 포멀 쪽",
+        "동아리/모임/회식(적당히 갖춘)": "캐주얼+단정 중간. 무난한 신발",
+        "출근/미팅(단정/실용)": "실용 + 단정. 과한 로고는 X",
+        "여행/나들이(활동/사진)": "활동성 + 사진발. 레이어드/색 조합",
+        "운동/러닝(스포티)": "기능성·움직임·땀 고려",
+        "집콕/근처 마실(편안)": "편안 최우선 + 최소한의 깔끔",
+        "결혼식/격식(포멀)": "격식. 어두운 톤/단정한 신발",
+        "장례식/예의(차분)": "무채색·단정·튀지 않게",
+    }
+    return mapping.get(s, "")
@@ -0,0 +1,165 @@
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import TTLCache, disk_dir
+from .http_client import ENDPOINTS, get_json
+
+# =========================
+# Free APIs (Nominatim / Open-Meteo)
+# =========================
+def fetch_reverse_geocode(lat, lon, budget=None):
+    params = {"format": "jsonv2", "lat": lat, "lon": lon}
+    return get_json("nominatim", "/reverse", params=params, budget=budget).get("display_name", "")
+
+def fetch_weather(lat, lon, budget=None):
+    params = {"latitude": lat, "longitude": lon, "current_weather": "true", "timezone": "auto"}
+    data = get_json("open-meteo", "/v1/forecast", params=params, budget=budget)
+    w = data.get("current_weather", {}) or {}
+    return {
+        "temperature": w.get("temperature"),
+        "windspeed": w.get("windspeed"),
+        "weathercode": w.get("weathercode"),
+        "time": w.get("time"),
+    }
+
+# 일별 예보 (여러 날 코디 계획용) — current_weather 대신 daily 필드로 한 번에
+DAILY_FIELDS = ["temperature_2m_max", "temperature_2m_min", "weather_code", "precipitation_probability_max"]
+FORECAST_DAYS = 7
+
+def fetch_daily_forecast(lat, lon, days=FORECAST_DAYS, budget=None):
+    """
+    [{"date", "temperature", "temp_max", "temp_min", "weathercode", "precipitation_probability"}] (날짜순)
+    - temperature = (최고 + 최저) / 2 → recommend 의 weather["temperature"] 로 그대로 씀
+    """
+    params = {"latitude": lat, "longitude": lon, "daily": ",".join(DAILY_FIELDS),
+              "forecast_days": days, "timezone": "auto"}
+    d = get_json("open-meteo", "/v1/forecast", params=params, budget=budget).get("daily", {}) or {}
+    out = []
+    for i, date in enumerate(d.get("time", [])):
+        def col(name):
+            vals = d.get(name) or []
+            return vals[i] if i < len(vals) else None
+        hi, lo = col("temperature_2m_max"), col("temperature_2m_min")
+        out.append({
+            "date": date,
+            "temperature": None if hi is None or lo is None else round((hi + lo) / 2, 1),
+            "temp_max": hi,
+            "temp_min": lo,
+            "weathercode": col("weather_code"),
+            "precipitation_probability": col("precipitation_probability_max"),
+        })
+    return out
+
+def empty_weather(error=""):
+    return {"temperature": None, "windspeed": None, "weathercode": None, "time": None, "error": error}
+
+# =========================
+# Cache (프로세스 전체 공유: 모든 세션/rerun 이 같이 씀)
+# =========================
+# 좌표를 격자로 반올림해서 근처 사용자끼리 같은 캐시 항목 사용 (0.01° ≈ 1km)
+GRID = float(os.environ.get("OOTD_GEO_GRID", "0.01"))
+geocode_cache = TTLCache(maxsize=1024, ttl=7 * 24 * 3600, disk_dir=disk_dir("geocode"))
+weather_cache = TTLCache(maxsize=1024, ttl=10 * 60, disk_dir=disk_dir("weather"))
+forecast_cache = TTLCache(maxsize=1024, ttl=60 * 60, disk_dir=disk_dir("forecast"))
+
+def grid_key(lat, lon, grid=None):
+    g = grid or GRID
+    return (round(round(float(lat) / g) * g, 6), round(round(float(lon) / g) * g, 6))
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+def _revalidate(cache: TTLCache, key, fetch, cache_if):
+    """렌더 예산과 상관없이 백그라운드에서 다시 받아 캐시 갱신 (같은 key 는 동시에 1개만)"""
+    token = (id(cache), key)
+    with _revalidating_lock:
+        if token in _revalidating:
+            return
+        _revalidating.add(token)
+
+    def run():
+        try:
+            v = fetch(*key)
+            if cache_if(v):
+                cache.set(key, v)
+        except:
+            pass
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(token)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def _cached_fetch(cache: TTLCache, key, fetch, budget, cache_if=lambda v: True):
+    """
+    - 신선한 캐시 → 그대로
+    - 없거나 만료 → budget 안에서 fetch
+    - fetch 실패/예산 초과 → 만료된 값이라도 있으면 그걸 반환하고 백그라운드 재검증
+    return: (value, stale_age_sec) — 새 값이면 stale_age_sec=None, 아무것도 없으면 (None, None)
+    """
+    v = cache.get(key, None)
+    if v is not None:
+        return v, None
+    try:
+        v = fetch(*key, budget=budget)
+        if cache_if(v):
+            cache.set(key, v)
+        return v, None
+    except:
+        stale = cache.get_stale(key)
+        _revalidate(cache, key, fetch, cache_if)
+        if stale is None:
+            return None, None
+        return stale
+
+def reverse_geocode(lat, lon, budget=None):
+    key = grid_key(lat, lon)
+    # 실패("")는 저장하지 않고 다음 rerun 때 다시 시도
+    v, _ = _cached_fetch(geocode_cache, key, fetch_reverse_geocode, budget, cache_if=bool)
+    return v or ""
+
+def get_weather(lat, lon, budget=None):
+    """
+    현재 날씨 dict. 응답이 늦거나 실패하면 예전 값에 "stale_sec"(몇 초 전 값인지)를 붙여서,
+    그것도 없으면 값이 모두 None 인 dict 에 "error" 를 붙여서 반환 (화면이 멈추지 않게)
+    """
+    key = grid_key(lat, lon)
+    v, age = _cached_fetch(weather_cache, key, fetch_weather, budget)
+    if v is None:
+        return empty_weather(f"{ENDPOINTS['open-meteo']['base_url']} 응답 없음")
+    if age is not None:
+        return dict(v, stale_sec=int(age))
+    return v
+
+def get_daily_forecast(lat, lon, days=FORECAST_DAYS, budget=None):
+    """
+    {"days": fetch_daily_forecast 결과} — get_weather 처럼 늦으면 예전 값 + "stale_sec",
+    아무것도 없으면 빈 "days" + "error"
+    """
+    key = grid_key(lat, lon) + (int(days),)
+    v, age = _cached_fetch(forecast_cache, key, fetch_daily_forecast, budget, cache_if=bool)
+    if not v:
+        return {"days": [], "error": f"{ENDPOINTS['open-meteo']['base_url']} 응답 없음"}
+    if age is not None:
+        return {"days": v, "stale_sec": int(age)}
+    return {"days": v}
+
+# =========================
+# Concurrent fetch (위치/날씨 동시에)
+# =========================
+# 프로세스 전체 공유 pool: 렌더마다 스레드를 새로 만들지 않음
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ootd-geo")
+
+def reverse_geocode_async(lat, lon, budget=None):
+    """위치 이름 조회를 백그라운드로 시작 → Future (결과는 reverse_geocode 와 같음)"""
+    return _pool.submit(reverse_geocode, lat, lon, budget)
+
+def location_result(future, budget=None):
+    """
+    reverse_geocode_async 결과를 남은 budget 만큼만 기다림
+    - 시간 안에 못 받거나 실패하면 "" (백그라운드 조회는 계속 돌아서 캐시에 남음)
+    """
+    try:
+        return future.result(timeout=None if budget is None else budget.remaining()) or ""
+    except:
+        return ""
@@ -0,0 +1,256 @@
+"""
+추천 기준 동작: 최적화 전 app.py 의 recommend (아이템별 dict 루프 + 카테고리별 선형 스캔 topk + 전체 조합 정렬) 를 그대로 옮긴 사본
+- 고치지 말 것 — 지금 코드(ootd.scoring.recommend)와 결과를 비교하는 기준
+- 원본과 다른 점: AI 리랭크 분기 제거, topk 개수(4)/outer 개수(3)를 per_category/outer_cap 인자로
+"""
+
+# =========================
+# Taste
+# =========================
+def taste_score_for_outfit(profile: dict, outfit: dict):
+    """
+    사용자 taste를 기반으로 outfit에 가산/감점
+    """
+    taste = profile.get("taste", {})
+    cp = taste.get("color_pref", {})
+    ca = taste.get("color_avoid", {})
+    pp = taste.get("pattern_pref", {})
+    pa = taste.get("pattern_avoid", {})
+    vp = taste.get("vibe_pref", {})
+    va = taste.get("vibe_avoid", {})
+
+    score = 0
+    reasons = []
+
+    colors = [it.get("color","unknown") for it in outfit.values()]
+    patterns = [it.get("pattern","unknown") for it in outfit.values()]
+    vibes = [it.get("vibe","unknown") for it in outfit.values()]
+
+    # 너무 강하게 하지 말고 "누적값의 log-like"로 완만하게
+    for c in colors:
+        if c != "unknown":
+            if c in cp:
+                add = min(2, int(cp[c] // 3) + 1)  # 1~2
+                score += add
+                reasons.append(f"취향(색) 선호: {c} (+{add})")
+            if c in ca:
+                sub = min(2, int(ca[c] // 3) + 1)
+                score -= sub
+                reasons.append(f"취향(색) 비선호: {c} (-{sub})")
+
+    for p in patterns:
+        if p != "unknown":
+            if p in pp:
+                add = min(2, int(pp[p] // 3) + 1)
+                score += add
+                reasons.append(f"취향(패턴) 선호: {p} (+{add})")
+            if p in pa:
+                sub = min(2, int(pa[p] // 3) + 1)
+                score -= sub
+                reasons.append(f"취향(패턴) 비선호: {p} (-{sub})")
+
+    for v in vibes:
+        if v != "unknown":
+            if v in vp:
+                add = min(2, int(vp[v] // 3) + 1)
+                score += add
+                reasons.append(f"취향(vibe) 선호: {v} (+{add})")
+            if v in va:
+                sub = min(2, int(va[v] // 3) + 1)
+                score -= sub
+                reasons.append(f"취향(vibe) 비선호: {v} (-{sub})")
+
+    return score, reasons[:10]
+
+# =========================
+# Color/pattern/vibe scoring
+# =========================
+NEUTRALS = {"black","white","gray","navy","beige","brown"}
+
+def color_compat_score(colors: dict):
+    vals = [c for c in colors.values() if c and c != "unknown"]
+    if not vals:
+        return 0, ["색 정보 부족(unknown)"]
+    reasons = []
+    score = 0
+    neutral_cnt = sum(1 for c in vals if c in NEUTRALS)
+    multi_cnt = sum(1 for c in vals if c == "multi")
+    if neutral_cnt >= 3:
+        score += 2; reasons.append("뉴트럴 중심이라 안정적")
+    elif neutral_cnt >= 2:
+        score += 1; reasons.append("뉴트럴 베이스라 매치 쉬움")
+    if multi_cnt >= 1 and neutral_cnt < 3:
+        score -= 1; reasons.append("멀티가 많으면 복잡할 수 있음")
+    return score, reasons
+
+def pattern_compat_score(patterns: dict):
+    vals = [p for p in patterns.values() if p and p != "unknown"]
+    if not vals:
+        return 0, ["패턴 정보 부족(unknown)"]
+    non_solid = [p for p in vals if p != "solid"]
+    if len(non_solid) == 0:
+        return 1, ["전체 무지라 깔끔"]
+    if len(non_solid) == 1:
+        return 2, ["패턴 1개 포인트"]
+    unique = set(non_solid)
+    if len(unique) >= 2:
+        return -1, ["서로 다른 패턴이 많으면 산만"]
+    return 0, ["같은 계열 패턴 다수(중립)"]
+
+def vibe_fit_score(vibes: dict, situation: str):
+    desired = set()
+    if any(x in situation for x in ["면접","발표","중요","출근","미팅","결혼식","장례식"]):
+        desired |= {"formal","minimal","dandy"}
+    if any(x in situation for x in ["데이트","소개팅","첫만남"]):
+        desired |= {"dandy","minimal","cute"}
+    if any(x in situation for x in ["운동","러닝"]):
+        desired |= {"sporty"}
+    if any(x in situation for x in ["학교","수업","꾸안꾸","집콕","근처 마실"]):
+        desired |= {"casual","minimal"}
+    if "여행" in situation or "나들이" in situation:
+        desired |= {"casual","street","minimal"}
+
+    vals = [v for v in vibes.values() if v and v != "unknown"]
+    if not vals or not desired:
+        return 0, ["vibe 정보 부족/상황 목표 없음"]
+    hit = sum(1 for v in vals if v in desired)
+    if hit >= 2:
+        return 2, ["상황과 vibe 다수 일치"]
+    if hit == 1:
+        return 1, ["상황과 vibe 일부 일치"]
+    return -1, ["상황 vibe와 다소 다름"]
+
+# =========================
+# Recommendation
+# =========================
+def recommend(profile, closet, weather, situation, user_style_primary=None, per_category=4, outer_cap=3):
+    temp_bias = float(profile.get("temp_bias", 0.0))
+    temp = weather.get("temperature")
+    effective_temp = None if temp is None else (temp + temp_bias)
+
+    wants_formal = any(x in situation for x in ["면접","발표","중요","출근","미팅","결혼식","장례식"])
+    wants_comfy  = any(x in situation for x in ["집콕","학교","꾸안꾸","근처","수업"])
+    wants_sporty = any(x in situation for x in ["운동","러닝"])
+    wants_date   = any(x in situation for x in ["데이트","소개팅","첫만남"])
+
+    item_scores = {}
+    item_reasons = {}
+
+    for it in closet:
+        s = 0
+        r = []
+        name = it.get("name","")
+        tp = it.get("type","")
+        warmth = it.get("warmth","unknown")
+        vibe = it.get("vibe","unknown")
+
+        if effective_temp is not None:
+            if effective_temp < 10:
+                if tp == "outer": s += 4; r.append("추움→아우터 가산")
+                if warmth == "thick": s += 2; r.append("thick→추운날 가산")
+                if warmth == "thin": s -= 1; r.append("thin→추운날 감점")
+            if effective_temp >= 22:
+                if tp == "outer": s -= 3; r.append("더움→아우터 감점")
+                if warmth == "thin": s += 1; r.append("thin→더운날 가산")
+                if warmth == "thick": s -= 1; r.append("thick→더운날 감점")
+
+        # situation + name keyword
+        if wants_formal:
+            if any(k in name for k in ["셔츠","슬랙","코트","자켓","블레이저","로퍼"]):
+                s += 3; r.append("격식 키워드 매칭")
+            if any(k in name for k in ["후드","트랙","조거","볼캡"]):
+                s -= 2; r.append("격식에 캐주얼 감점")
+        if wants_date and any(k in name for k in ["셔츠","니트","코트","자켓","로퍼","가디건"]):
+            s += 2; r.append("데이트/첫만남 깔끔 가산")
+        if wants_comfy and any(k in name for k in ["후드","맨투맨","티","청바지","가디건","스니커"]):
+            s += 2; r.append("편한상황 캐주얼 가산")
+        if wants_sporty:
+            if tp == "shoes": s += 2; r.append("운동→신발 중요")
+            if any(k in name for k in ["운동","트레이닝","러닝","조거","스니커"]):
+                s += 3; r.append("운동 키워드 매칭")
+
+        # optional style tag
+        if user_style_primary:
+            if it.get("primary_style") == user_style_primary or it.get("secondary_style") == user_style_primary:
+                s += 1; r.append("선택 스타일 태그 일치")
+
+        # vibe quick boost
+        if wants_formal and vibe in ["formal","minimal","dandy"]:
+            s += 1; r.append("격식상황 vibe 일치")
+        if wants_sporty and vibe == "sporty":
+            s += 1; r.append("운동상황 vibe 일치")
+        if wants_date and vibe in ["dandy","minimal","cute"]:
+            s += 1; r.append("데이트상황 vibe 일치")
+
+        item_scores[it["id"]] = s
+        item_reasons[it["id"]] = r if r else ["기본 점수"]
+
+    def topk(cat, k=4):
+        cand = [i for i in closet if i.get("type")==cat]
+        cand.sort(key=lambda x: item_scores.get(x["id"], 0), reverse=True)
+        return cand[:k]
+
+    tops = topk("top", per_category)
+    bottoms = topk("bottom", per_category)
+    outers = topk("outer", per_category)
+    shoes = topk("shoes", per_category)
+
+    if not tops or not bottoms or not shoes:
+        return None, [], {"error":"카테고리 부족(top/bottom/shoes 필요)"}, None
+
+    cid = 0
+    candidates = []
+
+    include_outer_default = True
+    if effective_temp is not None and effective_temp >= 22:
+        include_outer_default = False
+
+    outer_options = outers[:outer_cap] if outers else [None]
+    for t in tops:
+        for b in bottoms:
+            for s in shoes:
+                for o in outer_options:
+                    outfit = {"top": t, "bottom": b, "shoes": s}
+                    if o is not None:
+                        outfit["outer"] = o
+
+                    base = sum(item_scores.get(x["id"], 0) for x in outfit.values())
+                    rs = []
+                    for x in outfit.values():
+                        rs += item_reasons.get(x["id"], [])
+
+                    colors = {k: outfit[k].get("color","unknown") for k in outfit.keys()}
+                    patterns = {k: outfit[k].get("pattern","unknown") for k in outfit.keys()}
+                    vibes = {k: outfit[k].get("vibe","unknown") for k in outfit.keys()}
+
+                    c_sc, c_rs = color_compat_score(colors)
+                    p_sc, p_rs = pattern_compat_score(patterns)
+                    v_sc, v_rs = vibe_fit_score(vibes, situation)
+
+                    # ✅ 학습된 취향 점수(개인화)
+                    t_sc, t_rs = taste_score_for_outfit(profile, outfit)
+
+                    total = base + c_sc + p_sc + v_sc + t_sc
+
+                    # 더운 날 outer 감점
+                    if effective_temp is not None and effective_temp >= 22 and "outer" in outfit:
+                        total -= 1
+                        rs.append("더운날 아우터 감점")
+                    if not include_outer_default and "outer" in outfit:
+                        total -= 1
+
+                    cid += 1
+                    candidates.append({
+                        "id": f"c{cid}",
+                        "score": total,
+                        "outfit": outfit,
+                        "reasons": list(dict.fromkeys(rs + c_rs + p_rs + v_rs + t_rs))[:20]
+                    })
+
+    candidates.sort(key=lambda x: x["score"], reverse=True)
+    top_candidates = candidates[:6]
+    chosen = top_candidates[0] if top_candidates else None
+
+    ai_pick = None
+    meta = {"temp_bias": temp_bias, "effective_temp": effective_temp, "ai_rerank": bool(ai_pick)}
+    return chosen, top_candidates, meta, ai_pick
@@ -0,0 +1,186 @@
+import copy, random
+
+import pytest
+
+from ootd.closet_index import ClosetIndex, FIELDS
+from ootd.intent import ensure_tags
+from ootd.items import ClosetItem
+from ootd import scoring
+from ootd.scoring import recommend
+from ootd.vocab import CATEGORIES, COLORS, PATTERNS, WARMTH, VIBES, STYLES, SITUATIONS
+
+import baseline
+
+NAMES = ["검정 셔츠", "슬랙스", "후드티", "청바지", "운동화", "로퍼", "코트", "니트", "조거", "맨투맨", "자켓"]
+
+def make_item(rng, iid):
+    item = {
+        "id": iid,
+        "type": rng.choice(CATEGORIES),
+        "name": rng.choice(NAMES),
+        "color": rng.choice(COLORS + ["teal"]),
+        "pattern": rng.choice(PATTERNS),
+        "warmth": rng.choice(WARMTH),
+        "vibe": rng.choice(VIBES),
+        "primary_style": rng.choice(STYLES + [None]),
+        "secondary_style": None,
+    }
+    # 예전 아이템처럼 필드가 빠진 경우도 섞음
+    if rng.random() < 0.1:
+        del item[rng.choice(["color", "pattern", "warmth", "vibe"])]
+    return item
+
+# =========================
+# 기준 동작: closet 리스트 + store 의 upsert(같은 id 는 자리 유지) + 리스트 전체 스캔 필터
+# =========================
+def list_upsert(closet, item):
+    for i, x in enumerate(closet):
+        if x.get("id") == item["id"]:
+            closet[i] = item
+            return
+    closet.append(item)
+
+def list_remove(closet, item_id):
+    closet[:] = [x for x in closet if x.get("id") != item_id]
+
+def list_filter(closet, **conds):
+    def value(item, field):
+        return item.get(field, None if field == "type" else "unknown")
+    return [x for x in closet if all(v is None or value(x, f) == v for f, v in conds.items())]
+
+def random_ops(rng, steps):
+    """(op, arg) 시퀀스 — add(새 id) / upsert(있는 id) / remove(있거나 없는 id)"""
+    live, ops, n = [], [], 0
+    for _ in range(steps):
+        r = rng.random()
+        if r < 0.5 or not live:
+            iid = f"i{n}"
+            n += 1
+            live.append(iid)
+            ops.append(("add", make_item(rng, iid)))
+        elif r < 0.75:
+            ops.append(("add", make_item(rng, rng.choice(live))))
+        else:
+            iid = rng.choice(live + ["missing"])
+            if iid in live:
+                live.remove(iid)
+            ops.append(("remove", iid))
+    return ops
+
+def random_conds(rng):
+    pool = {
+        "type": CATEGORIES,
+        "color": COLORS + ["teal", "unknown"],
+        "pattern": PATTERNS + ["unknown"],
+        "warmth": WARMTH + ["unknown"],
+        "vibe": VIBES + ["unknown"],
+    }
+    return {f: (rng.choice(pool[f]) if rng.random() < 0.4 else None) for f in FIELDS}
+
+@pytest.mark.parametrize("seed", range(20))
+def test_filter_matches_list_scan(seed):
+    rng = random.Random(seed)
+    closet, index = [], ClosetIndex()
+    for op, arg in random_ops(rng, 300):
+        if op == "add":
+            list_upsert(closet, arg)
+            index.add(arg)
+        else:
+            list_remove(closet, arg)
+            index.remove(arg)
+
+        assert len(index) == len(closet)
+        assert [x["id"] for x in index] == [x["id"] for x in closet]
+        for _ in range(3):
+            conds = random_conds(rng)
+            assert [x.to_dict() for x in index.filter(**conds)] == list_filter(closet, **conds), conds
+
+    # 필터 선택지: 실제로 남아 있는 값만
+    for f in FIELDS:
+        expected = {x.get(f, None if f == "type" else "unknown") for x in closet} - {None}
+        assert set(index.values(f)) == expected
+
+def test_copy_does_not_touch_original():
+    rng = random.Random(0)
+    base = ClosetIndex([make_item(rng, f"i{n}") for n in range(30)])
+    before = [(x["id"], x["type"]) for x in base]
+    new = base.copy()
+    new.remove("i0")
+    new.add(make_item(rng, "i1"))
+    new.add(make_item(rng, "new"))
+    assert [(x["id"], x["type"]) for x in base] == before
+    assert "i0" in base and "new" not in base
+    i0 = base.get("i0")
+    assert i0 in base.filter(type=i0["type"], vibe=i0.get("vibe", "unknown"))
+    assert base.filter(color="x") == []
+
+def test_item_record_round_trip():
+    rng = random.Random(0)
+    items = [make_item(rng, f"i{n}") for n in range(200)]
+    items[0].update(color=None, pattern="", vibe="plaid", extra_key=[1, 2])
+    items[1].update(warmth=3, name_tags={"v": "old", "tags": ["formal"]})
+    for d in items[2:]:
+        ensure_tags(d)
+    for d in items:
+        it = ClosetItem.from_dict(d)
+        assert it.to_dict() == d
+        assert it.to_dict() is not it.to_dict()
+        assert all(it[k] == v for k, v in d.items())
+        assert it.get("missing", "x") == "x"
+        with pytest.raises(KeyError):
+            it["missing"]
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("search", ["beam", "exact"])
+def test_recommend_matches_baseline(seed, search):
+    """인덱스(점진 갱신)/리스트 입력 모두 최적화 전 recommend(tests/baseline.py)와 같은 결과"""
+    rng = random.Random(seed)
+    index = ClosetIndex()
+    closet = []
+    # 인덱스는 add/upsert/remove 로 점진 갱신, 리스트는 같은 결과의 plain list
+    for op, arg in random_ops(rng, 60):
+        if op == "add":
+            list_upsert(closet, arg)
+            index.add(arg)
+        else:
+            list_remove(closet, arg)
+            index.remove(arg)
+    profile = {"temp_bias": rng.uniform(-3, 3), "taste": {
+        "color_pref": {rng.choice(COLORS): 3}, "color_avoid": {rng.choice(COLORS): 2},
+        "pattern_pref": {}, "pattern_avoid": {},
+        "vibe_pref": {rng.choice(VIBES): 4}, "vibe_avoid": {},
+    }}
+    # exact 는 상한 없는 기준 동작(전체 조합)과 비교
+    caps = {"per_category": 10**6, "outer_cap": 10**6} if search == "exact" else {}
+    for _ in range(5):
+        weather = {"temperature": rng.choice([None, 0, 8, 15, 22, 30])}
+        situation = rng.choice(SITUATIONS)
+        style = rng.choice([None] + STYLES)
+        expected = baseline.recommend(copy.deepcopy(profile), closet, weather, situation, style, **caps)
+        for got in (recommend(copy.deepcopy(profile), index, weather, situation, style, search=search),
+                    recommend(copy.deepcopy(profile), closet, weather, situation, style, search=search)):
+            for c in got[1]:
+                del c["refs"]
+            assert got[:3] == expected[:3]
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("allow_no_outer", [False, True])
+def test_exact_matches_full_grid(seed, allow_no_outer):
+    rng = random.Random(seed)
+    closet = [make_item(rng, f"i{n}") for n in range(40)]
+    profile = {"temp_bias": 0, "taste": {"vibe_pref": {rng.choice(VIBES): 3}}}
+    for _ in range(5):
+        args = (profile, closet, {"temperature": rng.choice([None, 5, 25])}, rng.choice(SITUATIONS))
+        full = recommend(*args, per_category=10**6, outer_cap=10**6, allow_no_outer=allow_no_outer)
+        exact = recommend(*args, search="exact", allow_no_outer=allow_no_outer)
+        assert exact[1] == full[1]
+        assert "exact_fallback" not in exact[2]
+
+def test_exact_falls_back_to_beam(monkeypatch):
+    rng = random.Random(0)
+    closet = [make_item(rng, f"i{n}") for n in range(200)]
+    args = ({"temp_bias": 0}, closet, {"temperature": 25}, SITUATIONS[0])
+    monkeypatch.setattr(scoring, "EXACT_MAX_CELLS", 10)
+    exact = recommend(*args, search="exact")
+    assert exact[2]["exact_fallback"] is True
+    assert exact[1] == recommend(*args)[1]
@@ -0,0 +1,88 @@
+"""
+로컬 가짜 Nominatim / Open-Meteo 서버 (timeout·재시도·stale 대체값 확인용)
+
+    python tools/fake_geo_weather.py --port 8766 --latency 3 --fail-rate 0.3
+    OOTD_NOMINATIM_URL=http://127.0.0.1:8766 OOTD_OPEN_METEO_URL=http://127.0.0.1:8766 streamlit run app.py
+
+- GET /reverse → {"display_name": ...}, GET /v1/forecast → {"current_weather": {...}} (daily=... 이면 {"daily": {...}})
+- --latency: 응답 지연(초), --fail-rate: 이 비율로 503 응답
+"""
+import argparse, json, random, threading, time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+class Stats:
+    lock = threading.Lock()
+    requests = 0
+    connections = 0
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (Session 연결 재사용 확인)
+    latency = 0.0
+    fail_rate = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with Stats.lock:
+            Stats.connections += 1
+
+    def do_GET(self):
+        with Stats.lock:
+            Stats.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if random.random() < self.fail_rate:
+            return self._send(503, {"error": "fake failure"})
+        if url.path == "/reverse":
+            return self._send(200, {"display_name": f"가짜 위치 ({q.get('lat')}, {q.get('lon')})"})
+        if url.path == "/v1/forecast" and "daily" in q:
+            days = int(q.get("forecast_days", 7))
+            today = datetime.now().date()
+            return self._send(200, {"daily": {
+                "time": [(today + timedelta(days=i)).isoformat() for i in range(days)],
+                "temperature_2m_max": [round(14.0 + 3 * (i % 4), 1) for i in range(days)],
+                "temperature_2m_min": [round(5.0 + 3 * (i % 4), 1) for i in range(days)],
+                "weather_code": [(0, 1, 3, 61)[i % 4] for i in range(days)],
+                "precipitation_probability_max": [(0, 10, 30, 80)[i % 4] for i in range(days)],
+            }})
+        if url.path == "/v1/forecast":
+            return self._send(200, {"current_weather": {
+                "temperature": 12.5, "windspeed": 7.2, "weathercode": 1,
+                "time": datetime.now().strftime("%Y-%m-%dT%H:%M"),
+            }})
+        self._send(404, {"error": "not found"})
+
+    def _send(self, code, obj):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def serve(port=0, latency=0.0, fail_rate=0.0):
+    """백그라운드 스레드로 띄우고 (server, base_url) 반환 — 스크립트에서 import 해서 쓰기"""
+    handler = type("FakeHandler", (Handler,), {"latency": latency, "fail_rate": fail_rate})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    a = ap.parse_args()
+    server, url = serve(a.port, a.latency, a.fail_rate)
+    print(f"fake Nominatim/Open-Meteo on {url}  (OOTD_NOMINATIM_URL={url} OOTD_OPEN_METEO_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
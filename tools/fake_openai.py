@@ -0,0 +1,123 @@
+"""
+로컬 가짜 OpenAI Responses API (개발/부하 확인용)
+
+    python tools/fake_openai.py --port 8765 --latency 0.5 --fail-rate 0.2
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+
+- 이미지가 있으면 Vision 응답(사진 바이트 해시로 색/패턴 결정), 없으면 리랭크 응답(첫 후보 선택)
+- --latency: 응답 지연(초), --fail-rate: 이 비율로 500 응답 (재시도 확인용)
+"""
+import argparse, hashlib, json, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COLORS = ["black","white","gray","navy","beige","brown","blue","green","red"]
+PATTERNS = ["solid","stripe","check","denim","knit"]
+VIBES = ["casual","dandy","minimal","street","sporty"]
+
+class Stats:
+    lock = threading.Lock()
+    requests = 0
+    in_flight = 0
+    max_in_flight = 0
+
+def _vision_text(image_url: str):
+    h = int(hashlib.sha1(image_url.encode("utf-8")).hexdigest(), 16)
+    return json.dumps({
+        "color": COLORS[h % len(COLORS)],
+        "pattern": PATTERNS[(h // 7) % len(PATTERNS)],
+        "warmth": ["thin","normal","thick"][(h // 11) % 3],
+        "vibe": VIBES[(h // 13) % len(VIBES)],
+        "desc": "가짜 분석 결과",
+    }, ensure_ascii=False)
+
+def _rerank_text(prompt: str):
+    m = re.search(r"'id': '(c\d+)'", prompt)
+    return json.dumps({"best_id": m.group(1) if m else "c1", "why": "가짜 리랭크"}, ensure_ascii=False)
+
+def _response(model: str, text: str, prompt_chars: int = 0):
+    return {
+        "id": f"resp_fake_{time.time_ns()}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [{
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        # 토큰 수는 대충 글자수/4 (비용 표시 확인용)
+        "usage": {
+            "input_tokens": prompt_chars // 4, "output_tokens": len(text) // 4,
+            "total_tokens": prompt_chars // 4 + len(text) // 4,
+            "input_tokens_details": {"cached_tokens": 0}, "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+class Handler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        with Stats.lock:
+            Stats.requests += 1
+            Stats.in_flight += 1
+            Stats.max_in_flight = max(Stats.max_in_flight, Stats.in_flight)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.latency:
+                time.sleep(self.latency)
+            if not self.path.rstrip("/").endswith("/responses"):
+                return self._send(404, {"error": {"message": "not found"}})
+            if random.random() < self.fail_rate:
+                return self._send(500, {"error": {"message": "fake failure"}})
+
+            inp = body.get("input")
+            image_url = None
+            if isinstance(inp, list):
+                for msg in inp:
+                    for part in msg.get("content", []):
+                        if part.get("type") == "input_image":
+                            image_url = part.get("image_url", "")
+            text = _vision_text(image_url) if image_url else _rerank_text(str(inp))
+            self._send(200, _response(body.get("model", "fake"), text, len(str(inp))))
+        finally:
+            with Stats.lock:
+                Stats.in_flight -= 1
+
+    def _send(self, code, obj):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def serve(port=0, latency=0.0, fail_rate=0.0):
+    """백그라운드 스레드로 띄우고 (server, base_url) 반환 — 스크립트에서 import 해서 쓰기"""
+    handler = type("FakeHandler", (Handler,), {"latency": latency, "fail_rate": fail_rate})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    a = ap.parse_args()
+    server, url = serve(a.port, a.latency, a.fail_rate)
+    print(f"fake OpenAI on {url}  (OPENAI_BASE_URL={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()